@@ -21,4 +21,25 @@ def encrypt(plaintext, key):
             ct.append(ord(i) + randoms[n] + key)
         return bytes(ct).hex()
     except ValueError:
-        return "Error: Enter a smaller integer for the key"
\ No newline at end of file
+        return "Error: Enter a smaller integer for the key"
+
+def decrypt(ciphertext, key):
+    try:
+        if key=='':
+            raise EmptyError
+        key=int(key)
+        ct = bytes.fromhex(ciphertext)
+    except ValueError:
+        return "Error: Key an integer less than 256 and ciphertext hex"
+    except EmptyError:
+        return "Enter a key as an integer less than 256"
+
+    if len(ct) > len(randoms):
+        return "Error: Ciphertext longer than the random stream"
+    pt = []
+    for n,c in enumerate(ct):
+        value = c - randoms[n] - key
+        if value < 0:
+            return "Error: Wrong key for this ciphertext"
+        pt.append(chr(value))
+    return ''.join(pt)
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Key recovery for CryptoolCustomAlg.encrypt.
+
+Every ciphertext byte is ord(c) + randoms[n] + key, and randoms is fixed by
+seed(10), so each of the 256 keys is tried at once: one broadcast
+subtraction gives a (keys, length) array of candidate plaintexts. A key that
+gives a negative byte anywhere can't have produced the ciphertext and is
+dropped. The rest are ranked by the mean log-probability of their
+characters (English letter frequencies, spaces and common punctuation,
+heavy penalties for control bytes). Batches of ciphertexts are padded to one
+length and solved together.
+
+    python3 cryptool_attack.py bc94cdd4e35865ddd8c0eaa350
+"""
+import argparse
+import string
+import sys
+
+import numpy as np
+
+from CryptoolCustomAlg import randoms
+
+RANDOMS = np.array(randoms, dtype=np.int16)
+KEYS = np.arange(256, dtype=np.int16)
+BATCH = 64
+
+LETTER_FREQ = {
+    'e': 12.7, 't': 9.1, 'a': 8.2, 'o': 7.5, 'i': 7.0, 'n': 6.7, 's': 6.3, 'h': 6.1, 'r': 6.0,
+    'd': 4.3, 'l': 4.0, 'c': 2.8, 'u': 2.8, 'm': 2.4, 'w': 2.4, 'f': 2.2, 'g': 2.0, 'y': 2.0,
+    'p': 1.9, 'b': 1.3, 'v': 1.0, 'k': 0.8, 'j': 0.15, 'x': 0.15, 'q': 0.1, 'z': 0.07,
+}
+
+
+def _byte_log_probs():
+    """log10 probability of each byte value as a character of English text"""
+    weights = np.full(256, 1e-4)           # non-ASCII
+    weights[:32] = 1e-6                    # control characters
+    weights[127] = 1e-6
+    for c in string.printable[:-5]:        # printable, minus \t\n\r\x0b\x0c
+        weights[ord(c)] = 0.05
+    for c in '\t\n\r':
+        weights[ord(c)] = 0.2
+    for c in ',.\'"-!?':
+        weights[ord(c)] = 0.5
+    weights[ord(' ')] = 18.0
+    for c, freq in LETTER_FREQ.items():
+        weights[ord(c)] = freq
+        weights[ord(c.upper())] = freq / 10
+    return np.log10(weights / weights.sum())
+
+
+BYTE_LOG_PROBS = _byte_log_probs()
+
+
+def _decode(ciphertexts, numbers, log=sys.stderr):
+    """Bytes of each hex ciphertext; None, with a warning naming its line, for one that can't be used"""
+    raw = []
+    for number, ct in zip(numbers, ciphertexts):
+        try:
+            data = bytes.fromhex(ct)
+        except ValueError:
+            problem = "not hex"
+        else:
+            if len(data) <= len(RANDOMS):
+                raw.append(data)
+                continue
+            problem = f"longer than the {len(RANDOMS)}-byte random stream"
+        if log:
+            print(f"[!] Line {number}: {problem}, skipped", file=log)
+        raw.append(None)
+    return raw
+
+
+def _padded(raw):
+    """Ciphertext bytes -> (count, width) int16 array and a mask of real bytes"""
+    width = max((len(ct) for ct in raw), default=0)
+    values = np.zeros((len(raw), width), dtype=np.int16)
+    mask = np.zeros((len(raw), width), dtype=bool)
+    for row, ct in enumerate(raw):
+        values[row, :len(ct)] = np.frombuffer(ct, dtype=np.uint8)
+        mask[row, :len(ct)] = True
+    return values, mask
+
+
+def crack_many(ciphertexts, top=5, log=sys.stderr, numbers=None):
+    """
+    Recover the key of every hex ciphertext.
+    Returns one [(score, key, plaintext)] list per ciphertext, best first;
+    score is the mean log10 probability per character. Ciphertexts that
+    aren't hex (or are too long) get None and a warning on log, naming
+    them by `numbers` (their line numbers; default 1, 2, ...).
+    """
+    raw = _decode(ciphertexts, numbers or range(1, len(ciphertexts) + 1), log)
+    usable = [i for i, ct in enumerate(raw) if ct is not None]
+    results = [None] * len(raw)
+    for start in range(0, len(usable), BATCH):
+        rows = usable[start:start + BATCH]
+        for i, ranked in zip(rows, _crack_batch([raw[i] for i in rows], top)):
+            results[i] = ranked
+    return results
+
+
+def _crack_batch(raw, top):
+    values, mask = _padded(raw)
+    width = values.shape[1]
+    # (ciphertexts, keys, width): plaintext byte for every key at every position
+    plain = values[:, None, :] - RANDOMS[:width] - KEYS[:, None]
+    plain = np.where(mask[:, None, :], plain, 0)
+    valid = (plain >= 0).all(axis=2)
+    log_probs = np.where(mask[:, None, :], BYTE_LOG_PROBS[np.clip(plain, 0, 255)], 0.0)
+    lengths = np.maximum(mask.sum(axis=1), 1)[:, None]
+    scores = np.where(valid, log_probs.sum(axis=2) / lengths, -np.inf)
+
+    results = []
+    for row in range(len(raw)):
+        order = np.argsort(-scores[row], kind='stable')[:top]
+        length = int(mask[row].sum())
+        results.append([(float(scores[row, key]), int(key), ''.join(map(chr, plain[row, key, :length])))
+                        for key in order if valid[row, key]])
+    return results
+
+
+def crack(ciphertext, top=5):
+    """Ranked (score, key, plaintext) candidates for one hex ciphertext"""
+    candidates = crack_many([ciphertext], top, log=None)[0]
+    if candidates is None:
+        raise ValueError(f"not a usable hex ciphertext: {ciphertext[:40]!r}")
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recover the key of CryptoolCustomAlg ciphertexts")
+    parser.add_argument('ciphertexts', nargs='*', help="hex ciphertexts (default: one per line on stdin)")
+    parser.add_argument('-n', '--top', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.ciphertexts:
+        numbers, ciphertexts = range(1, len(args.ciphertexts) + 1), args.ciphertexts
+    else:
+        lines = [(number, line.strip()) for number, line in enumerate(sys.stdin, start=1) if line.strip()]
+        numbers, ciphertexts = [number for number, _ in lines], [line for _, line in lines]
+    for ciphertext, candidates in zip(ciphertexts, crack_many(ciphertexts, args.top, numbers=numbers)):
+        if candidates is None:
+            continue
+        print(f"[*] {ciphertext[:40]}")
+        if not candidates:
+            print("    no key in 0-255 fits")
+        for score, key, plaintext in candidates:
+            print(f"    key {key:3d} (score {score:.2f}): {plaintext!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streaming file mode for the CryptoolCustomAlg cipher.
+
+encrypt() in CryptoolCustomAlg.py stops at 624 characters (the end of
+randoms) and fails once ord(c) + offset + key passes 255. This mode works on
+files of any size:
+  - input is read as raw bytes in chunks into a reused bytearray
+  - every ciphertext value byte + offset + key is written as a little-endian
+    uint16 (2 bytes per input byte, no header), so the key can be anything
+    from 0 to MAX_KEY
+  - offsets keep drawing randint(1, 100) from the same seed past the first
+    624 (which are exactly `randoms`), in blocks via offsets.randint_array
+Decryption reverses this and stops with an error if a value falls outside
+0-255, which means a wrong key or seed.
+
+    python3 cryptool_stream.py encrypt -k 42 secret.bin secret.enc
+    python3 cryptool_stream.py decrypt -k 42 secret.enc secret.bin
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from offsets import randint_array
+
+CHUNK = 1 << 22
+SEED = 10
+MAX_KEY = 0xffff - 255 - 100
+
+
+class OffsetStream:
+    """The randint(1, 100) stream after seed(seed), handed out in blocks"""
+
+    def __init__(self, seed=SEED):
+        self.rng = random.Random(seed)
+
+    def take(self, count):
+        return randint_array(self.rng, count).astype(np.uint16)
+
+
+def _check_key(key):
+    if not 0 <= key <= MAX_KEY:
+        raise ValueError(f"key must be between 0 and {MAX_KEY}")
+
+
+def encrypt_stream(src, dst, key, seed=SEED, chunk_size=CHUNK):
+    """Encrypt binary file object src into dst; returns the bytes read"""
+    _check_key(key)
+    offsets = OffsetStream(seed)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    total = 0
+    while True:
+        size = src.readinto(buffer)
+        if not size:
+            break
+        values = np.frombuffer(view[:size], dtype=np.uint8).astype('<u2')
+        values += offsets.take(size)
+        values += key
+        dst.write(values.data)
+        total += size
+    return total
+
+
+def decrypt_stream(src, dst, key, seed=SEED, chunk_size=CHUNK):
+    """Decrypt binary file object src into dst; returns the bytes written"""
+    _check_key(key)
+    offsets = OffsetStream(seed)
+    buffer = bytearray(2 * chunk_size)
+    view = memoryview(buffer)
+    total, carry = 0, 0
+    while True:
+        read = src.readinto(view[carry:])
+        if not read:
+            break
+        size = carry + read
+        usable = size & ~1
+        values = np.frombuffer(view[:usable], dtype='<u2').astype(np.int32)
+        values -= offsets.take(len(values))
+        values -= key
+        if len(values) and (values.min() < 0 or values.max() > 255):
+            raise ValueError(f"value out of byte range near offset {total}: wrong key or seed")
+        dst.write(values.astype(np.uint8).data)
+        total += len(values)
+        # A read can end halfway through a value; keep that byte for the next one
+        carry = size - usable
+        if carry:
+            buffer[0] = buffer[usable]
+    if carry:
+        raise ValueError("ciphertext has an odd number of bytes")
+    return total
+
+
+def _open(path, mode):
+    if path == '-':
+        return (sys.stdin if 'r' in mode else sys.stdout).buffer
+    return open(path, mode)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encrypt or decrypt files with the CRYPtoOL custom cipher")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('input', help="input file ('-' for stdin)")
+    parser.add_argument('output', help="output file ('-' for stdout)")
+    parser.add_argument('-k', '--key', type=int, required=True, help=f"0-{MAX_KEY}")
+    parser.add_argument('-s', '--seed', type=int, default=SEED)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK)
+    args = parser.parse_args()
+
+    run = encrypt_stream if args.mode == 'encrypt' else decrypt_stream
+    start = time.perf_counter()
+    with _open(args.input, 'rb') as src, _open(args.output, 'wb') as dst:
+        try:
+            size = run(src, dst, args.key, args.seed, args.chunk_size)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+    elapsed = time.perf_counter() - start
+    rate = size / elapsed / 1e6 if elapsed else 0.0
+    print(f"[*] {args.mode}ed {size:,} bytes in {elapsed:.2f}s ({rate:.1f} MB/s)", file=sys.stderr)
+    if args.output != '-':
+        print(f"[*] Wrote {os.path.getsize(args.output):,} bytes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
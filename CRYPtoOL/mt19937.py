@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+MT19937 output inversion and state cloning for Python's random module.
+
+Each 32-bit output is a tempered state word. Tempering is invertible, so 624
+consecutive outputs give back 624 consecutive state words. Those are a valid
+state whatever the starting point, because every later word follows from the
+recurrence
+    x[n + 624] = x[n + 397] ^ twist((x[n] & UPPER) | (x[n + 1] & LOWER))
+The cloned state is loaded into a random.Random with setstate(), and that
+generator then continues the original stream, randint() rejection sampling
+included. offsets.randint_array draws from it in blocks.
+
+Partial output:
+  - Words that were not observed can be given as None. fill_gaps()
+    recovers them from the recurrence, run forwards and backwards, as long
+    as enough of the words around them are known.
+  - Words seen only in part, like the last word of a getrandbits(k) call
+    when k is not a multiple of 32 (only its top k % 32 bits survive), are
+    given as (value, mask). Their known bits are linear constraints on the
+    state, and solve_state() solves them over GF(2) together with the
+    recurrence. That needs more output: roughly as many known bits after
+    the first 624 words as there are unknown bits among them.
+  - randint(1, 100), as used by CryptoolCustomAlg, shows only the top 7 bits
+    of a word, and it skips the ~22% of words whose value is >= 100 without a
+    trace. 624 draws carry about 4.4 kbits against the 19937 bits of state,
+    and the skipped positions are unknown, so no state can be rebuilt from
+    them. For that stream, seed_search.py (unknown seed) or
+    offsets.seed_offsets (known seed) is the way in.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+N, M = 624, 397
+MATRIX_A = 0x9908b0df
+UPPER, LOWER = 0x80000000, 0x7fffffff
+MASK32 = 0xffffffff
+
+
+def temper(y):
+    """MT19937 output function (works on ints and uint32 arrays)"""
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9d2c5680
+    y ^= (y << 15) & 0xefc60000
+    y ^= y >> 18
+    return y & MASK32
+
+
+def _undo_right(y, shift):
+    x = y
+    for _ in range(32 // shift):
+        x = y ^ (x >> shift)
+    return x
+
+
+def _undo_left(y, shift, mask):
+    x = y
+    for _ in range(32 // shift):
+        x = y ^ ((x << shift) & mask)
+    return x & MASK32
+
+
+def untemper(y):
+    """State word behind a 32-bit output (works on ints and uint32 arrays)"""
+    if isinstance(y, np.ndarray):
+        y = y.astype(np.uint64)
+    y = _undo_right(y, 18)
+    y = _undo_left(y, 15, 0xefc60000)
+    y = _undo_left(y, 7, 0x9d2c5680)
+    y = _undo_right(y, 11)
+    return y.astype(np.uint32) if isinstance(y, np.ndarray) else y
+
+
+def _twist(y):
+    return (y >> 1) ^ (MATRIX_A if y & 1 else 0)
+
+
+def _untwist(t):
+    """y with _twist(y) == t; the top bit of t says whether y was odd"""
+    if t & UPPER:
+        return ((t ^ MATRIX_A) << 1) | 1
+    return t << 1
+
+
+def fill_gaps(words, max_passes=64):
+    """
+    Fill unknown (None) entries of a run of untempered state words using
+    the MT recurrence both ways. Returns a new list; entries that can't be
+    determined stay None.
+    """
+    x = list(words)
+    # Partial knowledge: top bit and low 31 bits of each word, tracked apart
+    top = [None if w is None else w & UPPER for w in x]
+    low = [None if w is None else w & LOWER for w in x]
+    for _ in range(max_passes):
+        changed = False
+        for n in range(len(x) - N):
+            a, b, c = n + N, n + M, n + 1
+            if x[a] is None and x[b] is not None and top[n] is not None and low[c] is not None:
+                x[a] = x[b] ^ _twist(top[n] | low[c])
+            elif x[a] is not None and x[b] is None and top[n] is not None and low[c] is not None:
+                x[b] = x[a] ^ _twist(top[n] | low[c])
+            elif x[a] is not None and x[b] is not None and (top[n] is None or low[c] is None):
+                y = _untwist(x[a] ^ x[b])
+                top[n], low[c] = y & UPPER, y & LOWER
+            else:
+                continue
+            changed = True
+            for i in (a, b):
+                if x[i] is not None:
+                    top[i], low[i] = x[i] & UPPER, x[i] & LOWER
+        for i, w in enumerate(x):
+            if w is None and top[i] is not None and low[i] is not None:
+                x[i] = top[i] | low[i]
+                changed = True
+        if not changed:
+            break
+    return x
+
+
+def _known(out):
+    """(value, mask of known bits) for an output given as int, None or (value, mask)"""
+    if out is None:
+        return 0, 0
+    if isinstance(out, tuple):
+        value, mask = out
+        return value & mask, mask & MASK32
+    return out, MASK32
+
+
+# Both maps are linear: untemper(1 << j) is the set of state bits output bit j
+# feeds, temper(1 << b) the set of output bits state bit b feeds
+_UNTEMPER_COLUMNS = [untemper(1 << j) for j in range(32)]
+_TEMPER_COLUMNS = [temper(1 << b) for b in range(32)]
+
+
+def solve_state(outputs):
+    """
+    The last 624 state words behind outputs that are only partly known, by
+    solving the MT recurrence as a linear system over GF(2).
+
+    Every unknown output bit in the first 624 words is a variable; a state
+    word is kept as 32 bitmasks over them (bit 0 the constant). Running the
+    recurrence forward gives each later word in those terms, and every known
+    bit of a later output is one equation. Words that are fully known are
+    put back as constants, so only the partly known ones stay symbolic.
+    """
+    known = [_known(out) for out in outputs]
+    variables = 0
+    words = []
+    for i, (value, mask) in enumerate(known[:N]):
+        bits = [(untemper(value) >> b) & 1 for b in range(32)]
+        if i == 0:
+            # Only the top bit of the first word is ever used: one variable at most
+            bits[:31] = [0] * 31
+            if any(not mask >> j & 1 and _UNTEMPER_COLUMNS[j] >> 31 for j in range(32)):
+                variables += 1
+                bits[31] = 1 << variables
+            words.append(bits)
+            continue
+        for j in range(32):
+            if not mask >> j & 1:
+                variables += 1
+                column = _UNTEMPER_COLUMNS[j]
+                for b in range(32):
+                    if column >> b & 1:
+                        bits[b] ^= 1 << variables
+        words.append(bits)
+
+    pivots = {}  # highest variable bit -> equation with it
+
+    def add(equation):
+        while equation > 1:
+            top = equation.bit_length() - 1
+            if top not in pivots:
+                pivots[top] = equation
+                return
+            equation ^= pivots[top]
+        if equation:
+            raise ValueError("outputs are inconsistent: not one MT19937 stream")
+
+    for i in range(N, len(known)):
+        x, x1, xm = words[i - N], words[i - N + 1], words[i - N + M]
+        y = x1[:31] + [x[31]]  # top bit of x[n], low 31 bits of x[n + 1]
+        bits = [xm[b] ^ (y[b + 1] if b < 31 else 0) ^ (y[0] if MATRIX_A >> b & 1 else 0) for b in range(32)]
+        value, mask = known[i]
+        for j in range(32):
+            if mask >> j & 1:
+                equation = value >> j & 1
+                for b in range(32):
+                    if _TEMPER_COLUMNS[b] >> j & 1:
+                        equation ^= bits[b]
+                add(equation)
+        if mask == MASK32:
+            word = untemper(value)
+            bits = [(word >> b) & 1 for b in range(32)]
+        words.append(bits)
+
+    # Back-substitute, lowest pivot first; a variable is determined only if
+    # every other variable in its equation is (bit 0, the constant, always is)
+    solution, determined = 0, 1
+    for top in sorted(pivots):
+        equation = pivots[top] ^ (1 << top)
+        if equation & ~determined:
+            continue
+        solution |= ((equation & 1) ^ (bin(equation & solution).count('1') & 1)) << top
+        determined |= 1 << top
+    state = []
+    missing = 0
+    for bits in words[-N:]:
+        if any(bit & ~determined for bit in bits):
+            missing += 1
+            continue
+        state.append(sum(((bit & 1) ^ (bin(bit & solution).count('1') & 1)) << b for b, bit in enumerate(bits)))
+    if missing:
+        raise ValueError(f"{missing} of the last {N} state words can't be determined; give more outputs")
+    return state
+
+
+def clone_state(outputs):
+    """
+    Generator state right after a run of 32-bit outputs: ints, None where
+    unknown, or (value, mask) where only the bits in mask are known. Gaps
+    are filled from the recurrence (fill_gaps) when that is enough, and by
+    solve_state() otherwise.
+    """
+    if len(outputs) < N:
+        raise ValueError(f"need at least {N} outputs, got {len(outputs)}")
+    if any(isinstance(out, tuple) for out in outputs):
+        return solve_state(outputs)
+    words = [None if out is None else untemper(out) for out in outputs]
+    if any(w is None for w in words[-N:]):
+        words = fill_gaps(words)
+    state = words[-N:]
+    if any(w is None for w in state):
+        return solve_state(outputs)
+    return state
+
+
+def clone(outputs):
+    """random.Random that continues the stream after the given 32-bit outputs"""
+    rng = random.Random()
+    rng.setstate((3, tuple(clone_state(outputs)) + (N,), None))
+    return rng
+
+
+def words_from_getrandbits(values, bits):
+    """
+    Split getrandbits(bits) results back into 32-bit outputs. A call uses
+    ceil(bits / 32) words, least significant first; a final partial word
+    only kept its top bits, so it becomes (value, mask) with those bits.
+    """
+    full, extra = divmod(bits, 32)
+    mask = ((1 << extra) - 1) << (32 - extra)
+    words = []
+    for value in values:
+        for _ in range(full):
+            words.append(value & MASK32)
+            value >>= 32
+        if extra:
+            words.append(((value << (32 - extra)) & mask, mask))
+    return words
+
+
+def clone_from_getrandbits(values, bits):
+    """
+    random.Random continuing after a run of getrandbits(bits) calls. When
+    bits is not a multiple of 32 the partial words are solved for, which
+    takes about two state lengths of words (1248, e.g. 624 calls of 33 bits)
+    or, for bits < 32, roughly 19968 / bits calls.
+    """
+    return clone(words_from_getrandbits(values, bits))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clone Python's MT19937 from its output")
+    parser.add_argument('--seed', type=int, default=10, help="seed of the generator to clone")
+    parser.add_argument('--skip', type=int, default=1000, help="outputs drawn before observing")
+    parser.add_argument('--gaps', type=int, default=0, help="hide this many observed words")
+    args = parser.parse_args()
+
+    original = random.Random(args.seed)
+    for _ in range(args.skip):
+        original.getrandbits(32)
+    observed = [original.getrandbits(32) for _ in range(2 * N if args.gaps else N)]
+    hidden = random.Random(1).sample(range(len(observed) - N, len(observed)), args.gaps)
+    for i in hidden:
+        observed[i] = None
+
+    start = time.perf_counter()
+    rng = clone(observed)
+    elapsed = time.perf_counter() - start
+    predicted = [rng.randint(1, 100) for _ in range(1000)]
+    actual = [original.randint(1, 100) for _ in range(1000)]
+    print(f"[*] Cloned from {len(observed)} outputs ({args.gaps} hidden) in {elapsed * 1000:.1f} ms")
+    print(f"[*] Next 1000 randint(1, 100) predicted {'correctly' if predicted == actual else 'WRONG'}")
+
+
+if __name__ == "__main__":
+    main()
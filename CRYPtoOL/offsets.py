@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+The CryptoolCustomAlg offset stream (randint(1, 100) draws) without a
+Python call per value.
+
+randint(1, 100) is 1 + _randbelow(100): a 7-bit getrandbits() call, i.e. one
+32-bit Mersenne Twister word shifted right by 25, redrawn while it is >= 100.
+getrandbits(32 * m) returns m consecutive words of the same stream packed
+little-endian, so a block of words can be drawn at once and the shift and
+rejection done in NumPy. Each block asks for only as many words as values
+still needed. Every word yields at most one value, so the generator is never
+advanced past the last word randint would have used, and later draws from the
+same generator line up with the pure-Python stream.
+"""
+import random
+
+import numpy as np
+
+
+def randint_array(rng, count, low=1, high=100):
+    """
+    The next `count` values of rng.randint(low, high) as a uint32 array,
+    consuming exactly the words randint would have.
+    """
+    span = high - low + 1
+    bits = span.bit_length()
+    if not 0 < bits <= 32:
+        raise ValueError("range must hold between 1 and 2**32 - 1 values")
+    out = np.empty(count, dtype=np.uint32)
+    filled = 0
+    while filled < count:
+        need = count - filled
+        words = np.frombuffer(rng.getrandbits(32 * need).to_bytes(4 * need, 'little'), dtype='<u4')
+        values = words >> (32 - bits)
+        values = values[values < span]
+        out[filled:filled + len(values)] = values
+        filled += len(values)
+    return out + low
+
+
+def seed_offsets(seed, count):
+    """First `count` offsets after seed(seed), as uint8 (offsets are 1-100)"""
+    return randint_array(random.Random(seed), count).astype(np.uint8)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Seed-space search for CryptoolCustomAlg variants seeded with an unknown value.
+
+The first `width` offsets of every seed 0..seeds-1 are computed once into a
+table of uint8 rows (row i = seed i) saved as .npy. Later runs memory-map
+that table, so a search never reseeds Python's RNG. The table is rebuilt
+only when it is too small for the request. Building and matching are both
+split into seed ranges across a process pool.
+
+A ciphertext is matched against the table in one of two ways:
+  crib       c[n] - p[n] = offset[n] + key for a known plaintext prefix p,
+             i.e. every row whose difference from c - p is one constant
+             0-255 (the key), or exactly the given --key
+  printable  every c[n] - offset[n] - key must be printable ASCII, which
+             bounds the key to a range for each seed; seeds whose range is
+             empty (or excludes --key) are dropped
+Surviving (seed, key) pairs are decrypted and ranked with the byte scores
+from cryptool_attack inside the workers, each seed's whole key range in one
+broadcast, and only the best `top` of each range come back to the parent.
+Offsets for a ciphertext no longer than the table width come from the table;
+longer ones cost one reseed per fitting seed.
+
+    python3 seed_search.py <hex> --crib "Hello"
+    python3 seed_search.py <hex> --seeds 4000000 --printable
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cryptool_attack import BYTE_LOG_PROBS
+from offsets import seed_offsets
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLE_FILE = os.path.join(HERE, 'seed_offsets.npy')
+BLOCK = 1 << 16
+PRINTABLE = (32, 126)
+
+
+def _fill_rows(path, start, stop):
+    table = np.load(path, mmap_mode='r+')
+    width = table.shape[1]
+    for seed in range(start, stop):
+        table[seed] = seed_offsets(seed, width)
+    table.flush()
+    return stop - start
+
+
+def _ranges(total, parts):
+    size = -(-total // max(parts, 1))
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def build_table(path, seeds, width, workers=None, log=sys.stderr):
+    """Write the offsets of seeds 0..seeds-1 to a (seeds, width) uint8 .npy"""
+    workers = workers or os.cpu_count() or 1
+    partial = path + '.partial.npy'
+    np.lib.format.open_memmap(partial, mode='w+', dtype=np.uint8, shape=(seeds, width)).flush()
+    start = time.time()
+    # Many small ranges rather than one per worker, so progress can be shown
+    ranges = _ranges(seeds, max(workers * 16, seeds // 50000))
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for count in pool.map(_fill_rows, [partial] * len(ranges), *zip(*ranges)):
+            done += count
+            if log:
+                rate = done / (time.time() - start)
+                print(f"\r[*] {done:,}/{seeds:,} seeds ({rate:,.0f} seeds/sec)", end='', file=log, flush=True)
+    if log:
+        print(file=log)
+    os.replace(partial, path)
+
+
+def load_table(path=TABLE_FILE, seeds=1 << 20, width=64, workers=None, log=sys.stderr):
+    """Memory-mapped offset table covering at least seeds x width, built if needed"""
+    if os.path.exists(path):
+        table = np.load(path, mmap_mode='r')
+        if table.shape[0] >= seeds and table.shape[1] >= width:
+            return table
+        seeds, width = max(seeds, table.shape[0]), max(width, table.shape[1])
+        del table
+    if log:
+        print(f"[*] Building {seeds:,} x {width} offset table at {path}", file=log)
+    build_table(path, seeds, width, workers, log)
+    return np.load(path, mmap_mode='r')
+
+
+def _crib_matches(rows, diffs, key):
+    """Seeds (row indices) and keys whose offsets + key equal diffs"""
+    # key = diffs[n] - offset[n] for every n, so it must be the same at each n
+    keys = diffs - rows.astype(np.int16)
+    if key is not None:
+        hit = (keys == key).all(axis=1)
+        return np.flatnonzero(hit), np.full(np.count_nonzero(hit), key)
+    hit = (keys == keys[:, :1]).all(axis=1) & (keys[:, 0] >= 0) & (keys[:, 0] <= 255)
+    return np.flatnonzero(hit), keys[hit, 0]
+
+
+def _printable_matches(rows, values, key):
+    """Seeds and (low, high) key ranges that keep every byte printable"""
+    remaining = values - rows.astype(np.int16)  # plaintext + key
+    low = np.maximum((remaining - PRINTABLE[1]).max(axis=1), 0)
+    high = np.minimum((remaining - PRINTABLE[0]).min(axis=1), 255)
+    if key is not None:
+        low, high = np.maximum(low, key), np.minimum(high, key)
+    hit = low <= high
+    return np.flatnonzero(hit), low[hit], high[hit]
+
+
+def match_range(path, start, stop, ciphertext, crib=None, key=None):
+    """
+    Worker: scan table rows start..stop.
+    Returns [(seed, low_key, high_key)] for every seed that fits.
+    """
+    table = np.load(path, mmap_mode='r')
+    values = np.frombuffer(ciphertext, dtype=np.uint8).astype(np.int16)
+    if crib is not None:
+        width = min(len(crib), len(values), table.shape[1])
+        diffs = values[:width] - np.frombuffer(crib, dtype=np.uint8)[:width].astype(np.int16)
+    else:
+        width = min(len(values), table.shape[1])
+    hits = []
+    for block in range(start, stop, BLOCK):
+        rows = table[block:min(block + BLOCK, stop), :width]
+        if crib is not None:
+            seeds, keys = _crib_matches(rows, diffs, key)
+            hits.extend((block + int(s), int(k), int(k)) for s, k in zip(seeds, keys))
+        else:
+            seeds, low, high = _printable_matches(rows, values[:width], key)
+            hits.extend((block + int(s), int(lo), int(hi)) for s, lo, hi in zip(seeds, low, high))
+    return hits
+
+
+def decrypt_with(ciphertext, offsets, low, high):
+    """
+    Plaintexts for keys low..high under one seed's offsets, in one broadcast:
+    (keys, (keys, length) uint8 plaintexts), dropping keys that make a byte negative.
+    """
+    keys = np.arange(low, high + 1, dtype=np.int16)
+    plain = (np.frombuffer(ciphertext, dtype=np.uint8).astype(np.int16)
+             - offsets.astype(np.int16))[None, :] - keys[:, None]
+    valid = (plain >= 0).all(axis=1)
+    return keys[valid], plain[valid].astype(np.uint8)
+
+
+def rank_range(path, start, stop, ciphertext, crib=None, key=None, top=10):
+    """
+    Worker: match rows start..stop, then decrypt and score every fitting
+    (seed, key) here rather than in the parent.
+    Returns (seeds that fit, [(score, seed, key, plaintext bytes)] of at most top).
+    """
+    hits = match_range(path, start, stop, ciphertext, crib, key)
+    table = np.load(path, mmap_mode='r')
+    # Short ciphertexts read their offsets from the table; longer ones reseed once per seed
+    from_table = len(ciphertext) <= table.shape[1]
+    best = []
+    for seed, low, high in hits:
+        offsets = table[seed, :len(ciphertext)] if from_table else seed_offsets(seed, len(ciphertext))
+        keys, plain = decrypt_with(ciphertext, offsets, low, high)
+        if not len(keys):
+            continue
+        scores = BYTE_LOG_PROBS[plain].mean(axis=1) if plain.shape[1] else np.zeros(len(keys))
+        for i in np.argsort(scores)[::-1][:top]:
+            entry = (float(scores[i]), seed, int(keys[i]), plain[i].tobytes())
+            if len(best) < top:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+            else:
+                break  # the rest of this seed scores lower still
+    return len(hits), best
+
+
+def search_seeds(ciphertext, crib=None, key=None, seeds=1 << 20, width=64, path=TABLE_FILE,
+                 top=10, workers=None, log=sys.stderr):
+    """
+    Find (seed, key) pairs consistent with a ciphertext (raw bytes).
+    Returns (matches, [(score, seed, key, plaintext)] best first).
+    """
+    workers = workers or os.cpu_count() or 1
+    if crib is not None and not crib:
+        raise ValueError("crib must not be empty")
+    table = load_table(path, seeds, width, workers, log)
+    seeds = min(seeds, table.shape[0])
+    del table
+
+    start = time.time()
+    ranges = _ranges(seeds, workers)
+    matches = 0
+    best = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for count, ranked in pool.map(rank_range, [path] * len(ranges), *zip(*ranges),
+                                      [ciphertext] * len(ranges), [crib] * len(ranges),
+                                      [key] * len(ranges), [top] * len(ranges)):
+            matches += count
+            best.extend(ranked)
+    if log:
+        elapsed = time.time() - start
+        print(f"[*] {seeds:,} seeds scanned and ranked in {elapsed:.2f}s ({seeds / elapsed:,.0f} seeds/sec), "
+              f"{matches:,} fit", file=log)
+    return matches, [(score, seed, k, plain.decode('latin-1'))
+                     for score, seed, k, plain in heapq.nlargest(top, best)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search seeds for a CryptoolCustomAlg ciphertext")
+    parser.add_argument('ciphertext', help="hex ciphertext")
+    parser.add_argument('-c', '--crib', help="known plaintext prefix")
+    parser.add_argument('-p', '--printable', action='store_true',
+                        help="no crib: require every decrypted byte to be printable ASCII")
+    parser.add_argument('-k', '--key', type=int, help="key, if known")
+    parser.add_argument('-s', '--seeds', type=int, default=1 << 20, help="search seeds 0..SEEDS-1")
+    parser.add_argument('--width', type=int, default=64, help="offsets stored per seed")
+    parser.add_argument('--table', default=TABLE_FILE)
+    parser.add_argument('-n', '--top', type=int, default=10)
+    parser.add_argument('-w', '--workers', type=int, default=None, help="default: all cores")
+    args = parser.parse_args()
+    if not args.crib and not args.printable:
+        parser.error("give a --crib or --printable")
+
+    crib = args.crib.encode('latin-1') if args.crib else None
+    matches, results = search_seeds(bytes.fromhex(args.ciphertext), crib, args.key, args.seeds,
+                                    args.width, args.table, args.top, args.workers)
+    for score, seed, key, plaintext in results:
+        print(f"seed {seed:10d} key {key:3d} (score {score:.2f}): {plaintext[:80]!r}")
+    if not matches:
+        print("No seed in range fits")
+
+
+if __name__ == "__main__":
+    main()
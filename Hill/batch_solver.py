@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Batch mode: solve a file of ciphertexts across a process pool.
+
+Input is one ciphertext per line, or JSONL with a "ciphertext" field (and an
+optional "id"). Every ciphertext goes through the Caesar, Vigenere, Atbash
+and rail fence analyzers, and their best candidates are ranked together by
+quadgram fitness. Lines are sent to the workers in small batches, and each
+result is written as a JSON line as soon as its batch is done, so output
+order follows completion, not input order.
+
+    python3 batch_solver.py ciphertexts.txt > results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cipher_engine import PreparedText, add_workers_argument, atbash, caesar_all_shifts, submit_bounded
+from hill_cipher import crack_2x2
+from ngram_score import default_scorer
+import rail_fence
+from vigenere_solver import solve_vigenere
+
+
+def caesar_candidates(text):
+    return [('caesar', shift, plaintext) for shift, plaintext in enumerate(caesar_all_shifts(text))]
+
+
+def vigenere_candidates(text):
+    return [('vigenere', key, plaintext) for key, _, plaintext in solve_vigenere(text)]
+
+
+def atbash_candidates(text):
+    return [('atbash', None, atbash(text))]
+
+
+def rail_fence_candidates(text):
+    return [('rail_fence', {'rails': rails, 'offset': offset}, plaintext)
+            for _, rails, offset, plaintext in rail_fence.search(text, top=3)]
+
+
+def hill_candidates(text):
+    return [('hill', key, plaintext) for _, key, plaintext in crack_2x2(text, top=3)]
+
+
+ANALYZERS = {
+    'caesar': caesar_candidates,
+    'vigenere': vigenere_candidates,
+    'atbash': atbash_candidates,
+    'rail_fence': rail_fence_candidates,
+    'hill': hill_candidates,
+}
+DEFAULT_ANALYZERS = ['caesar', 'vigenere', 'atbash', 'rail_fence']
+
+
+def solve(text, analyzers=DEFAULT_ANALYZERS, top=5):
+    """Best `top` candidates over all analyzers: [{method, key, fitness, plaintext}]"""
+    candidates = []
+    for name in analyzers:
+        try:
+            candidates.extend(ANALYZERS[name](text))
+        except ValueError:  # e.g. too few letters for the analyzer
+            continue
+    if not candidates:
+        return []
+    # Score against the ciphertext's letter count so no analyzer gains by dropping letters
+    fitness = default_scorer().score_many([plaintext for _, _, plaintext in candidates], True,
+                                          len(PreparedText(text)))
+    ranked = sorted(zip(fitness, candidates), key=lambda item: item[0], reverse=True)[:top]
+    return [{'method': method, 'key': _jsonable(key), 'fitness': round(float(score), 4), 'plaintext': plaintext}
+            for score, (method, key, plaintext) in ranked]
+
+
+def _jsonable(key):
+    if hasattr(key, 'tolist'):
+        return key.tolist()
+    return key
+
+
+def solve_batch(records, analyzers, top):
+    """Worker entry point: [(id, ciphertext)] -> [result dict], an error dict for records that fail"""
+    results = []
+    for record_id, text in records:
+        try:
+            results.append({'id': record_id, 'ciphertext': text, 'results': solve(text, analyzers, top)})
+        except Exception as e:  # one bad ciphertext mustn't take its batch down
+            results.append({'id': record_id, 'error': f"{type(e).__name__}: {e}"})
+    return results
+
+
+def read_records(lines, log=sys.stderr):
+    """(id, ciphertext) per non-blank line; plain text ids are line numbers. Bad JSON records are skipped."""
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            continue
+        if line.lstrip().startswith('{'):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                pass
+            else:
+                text = record.get('ciphertext') if isinstance(record, dict) else None
+                if not isinstance(text, str):
+                    if log:
+                        print(f"[!] Line {number}: no \"ciphertext\" string, skipped", file=log)
+                    continue
+                yield record.get('id', number), text
+                continue
+        yield number, line
+
+
+def _batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batch(lines, out=sys.stdout, analyzers=DEFAULT_ANALYZERS, top=5, workers=None,
+              batch_size=8, log=sys.stderr):
+    """Solve every record from lines, writing a JSON line per ciphertext as it finishes"""
+    workers = workers or os.cpu_count() or 1
+    start, solved = time.time(), 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results go out as each batch finishes, so output order follows completion, not input
+        batches = _batches(read_records(lines, log), batch_size)
+        for future in submit_bounded(pool, solve_batch, batches, workers * 2, analyzers, top):
+            for result in future.result():
+                out.write(json.dumps(result) + '\n')
+                solved += 1
+            out.flush()
+
+    if log:
+        elapsed = time.time() - start
+        rate = solved / elapsed if elapsed else 0.0
+        print(f"[*] {solved:,} ciphertexts in {elapsed:.1f}s ({rate:,.1f}/sec)", file=log)
+    return solved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a file of ciphertexts (one per line or JSONL)")
+    parser.add_argument('file', nargs='?', help="input file (default: stdin)")
+    parser.add_argument('-o', '--output', help="write JSONL here instead of stdout")
+    parser.add_argument('-a', '--analyzers', nargs='+', choices=sorted(ANALYZERS), default=DEFAULT_ANALYZERS)
+    parser.add_argument('-n', '--top', type=int, default=5, help="candidates kept per ciphertext")
+    add_workers_argument(parser)
+    parser.add_argument('-b', '--batch-size', type=int, default=8, help="ciphertexts per worker task")
+    args = parser.parse_args()
+
+    source = open(args.file, encoding='utf-8', errors='replace') if args.file else sys.stdin
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        run_batch(source, out, args.analyzers, args.top, args.workers, args.batch_size)
+    finally:
+        if args.file:
+            source.close()
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Hill/ cipher primitives across input sizes.
+
+Each primitive runs on seeded, generated English-like text from 30 bytes up
+to 100 MB. Throughput (chars/sec, best of several runs) and peak traced
+memory (tracemalloc, measured in a separate run) are printed and saved as
+JSON. Passing --baseline with an earlier JSON file prints the speedup or
+regression for every primitive and size.
+
+The Caesar and Vigenere primitives come from cipher_engine, which the
+scripts use for them. The functions defined in (or imported by name into)
+crypto_solver.py and crypto_solver2.py are loaded straight from those
+scripts, so the benchmark measures exactly what they call without running
+their top-level analysis.
+
+    python3 benchmark.py -o bench.json
+    python3 benchmark.py --max-size 10M --baseline bench.json
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+from cipher_engine import caesar_decrypt, vigenere_decrypt
+from stream_analysis import CHUNK, StreamAnalyzer
+from vigenere_solver import ENGLISH_FREQ
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SIZES = [30, 1_000, 100_000, 10_000_000, 100_000_000]
+MIN_TIME = 0.2
+
+
+def load_script_functions(filename, names):
+    """
+    Get the named functions from a script without executing its top-level
+    code: only its imports and those function definitions run, so names the
+    script imports (e.g. atbash_cipher) are found too.
+    """
+    path = os.path.join(HERE, filename)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    keep = [node for node in tree.body
+            if isinstance(node, (ast.Import, ast.ImportFrom))
+            or (isinstance(node, ast.FunctionDef) and node.name in names)]
+    namespace = {'__name__': os.path.splitext(filename)[0], '__file__': path}
+    exec(compile(ast.Module(body=keep, type_ignores=[]), path, 'exec'), namespace)
+    return {name: namespace[name] for name in names}
+
+
+def generate_text(size, seed=0):
+    """English-like text: letters at English frequencies, mixed case, with spaces and punctuation"""
+    rng = np.random.default_rng(seed)
+    alphabet = np.frombuffer(b'abcdefghijklmnopqrstuvwxyz ,.', dtype=np.uint8)
+    weights = np.concatenate([ENGLISH_FREQ * 0.8, [0.17, 0.015, 0.015]])
+    chars = rng.choice(alphabet, size=size, p=weights / weights.sum())
+    upper = (rng.random(size) < 0.05) & (chars >= ord('a'))
+    chars[upper] -= 32
+    return chars.tobytes().decode('ascii')
+
+
+def _stream_analyzer(text):
+    """Feed in CHUNK-sized pieces, as analyze_file() does"""
+    analyzer, data = StreamAnalyzer(max_n=3), text.encode('ascii')
+    for start in range(0, len(data), CHUNK):
+        analyzer.feed(data[start:start + CHUNK])
+
+
+def primitives():
+    """name -> callable(text)"""
+    solver = load_script_functions('crypto_solver.py', ['analyze_frequency'])
+    solver2 = load_script_functions('crypto_solver2.py', ['rail_fence_decrypt', 'atbash_cipher'])
+    return {
+        'caesar_cipher_decrypt': lambda text: caesar_decrypt(text, 3),
+        'vigenere_decrypt': lambda text: vigenere_decrypt(text, 'HAUNTED'),
+        'rail_fence_decrypt': lambda text: solver2['rail_fence_decrypt'](text, 5),
+        'atbash_cipher': solver2['atbash_cipher'],
+        'analyze_frequency': solver['analyze_frequency'],
+        'stream_analysis': _stream_analyzer,
+    }
+
+
+def time_call(func, text):
+    """Best wall time of func(text) over enough runs to fill MIN_TIME"""
+    best, spent, runs = float('inf'), 0.0, 0
+    while runs < 3 or (spent < MIN_TIME and runs < 1000):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+        if elapsed > 5:
+            break
+    return best, runs
+
+
+def peak_memory(func, text):
+    tracemalloc.start()
+    try:
+        func(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def parse_size(value):
+    units = {'K': 1_000, 'M': 1_000_000, 'G': 1_000_000_000}
+    value = value.upper().rstrip('B')
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def run(sizes, names=None, log=print):
+    results = []
+    funcs = primitives()
+    for size in sizes:
+        text = generate_text(size)
+        for name, func in funcs.items():
+            if names and name not in names:
+                continue
+            seconds, runs = time_call(func, text)
+            peak = peak_memory(func, text)
+            result = {
+                'primitive': name,
+                'size': size,
+                'seconds': seconds,
+                'runs': runs,
+                'chars_per_sec': size / seconds if seconds else float('inf'),
+                'peak_bytes': peak,
+            }
+            results.append(result)
+            log(f"{name:22} {size:>12,} B  {result['chars_per_sec']:>14,.0f} chars/s  "
+                f"peak {peak / 1e6:>9.2f} MB  ({runs} runs)")
+    return results
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(r['primitive'], r['size']): r for r in json.load(f)['results']}
+    print(f"\n=== Compared with {baseline_path} ===")
+    for result in results:
+        before = baseline.get((result['primitive'], result['size']))
+        if not before:
+            continue
+        speedup = result['chars_per_sec'] / before['chars_per_sec']
+        marker = '  REGRESSION' if speedup < 0.9 else ''
+        print(f"{result['primitive']:22} {result['size']:>12,} B  {speedup:6.2f}x{marker}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Hill/ cipher primitives")
+    parser.add_argument('-o', '--output', default='bench_results.json')
+    parser.add_argument('--max-size', type=parse_size, default=SIZES[-1], help="e.g. 10M (default 100M)")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, help="explicit sizes instead of the defaults")
+    parser.add_argument('-p', '--primitives', nargs='+', help="only these primitives")
+    parser.add_argument('--baseline', help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    sizes = args.sizes or [size for size in SIZES if size <= args.max_size]
+    results = run(sizes, args.primitives)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
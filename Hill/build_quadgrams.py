@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Build the quadgram log-probability table used by ngram_score.py.
+
+Counts every 4-letter window (letters only, case folded) in the corpus files
+and writes log10 probabilities as a flat float32 array of 26**4 entries.
+Unseen quadgrams get a floor of log10(0.01 / total).
+
+    python3 build_quadgrams.py corpus.txt [more.txt ...] --python-docs -o quadgrams.npy
+"""
+import argparse
+
+import numpy as np
+
+from cipher_engine import PreparedText
+from ngram_score import quadgram_ids
+
+SIZE = 26 ** 4
+CHUNK = 1 << 20
+
+
+def count_text(text, counts, carry=None):
+    """Add the quadgrams of text to counts, continuing from the carried last 3 letters"""
+    values = PreparedText(text).values
+    if carry is not None:
+        values = np.concatenate([carry, values])
+    if len(values) >= 4:
+        counts += np.bincount(quadgram_ids(values), minlength=SIZE)
+    return values[-3:]
+
+
+def count_file(path, counts):
+    """Count a corpus file in fixed-size chunks"""
+    carry = None
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                break
+            carry = count_text(chunk, counts, carry)
+
+
+def python_docs_text():
+    """English prose shipped with every CPython install (the pydoc topic pages)"""
+    from pydoc_data.topics import topics
+    return '\n'.join(topics.values())
+
+
+def build_table(counts):
+    """log10 probabilities with a floor for unseen quadgrams"""
+    total = counts.sum()
+    if not total:
+        raise ValueError("Corpus contains no quadgrams")
+    table = np.full(SIZE, np.log10(0.01 / total), dtype=np.float64)
+    seen = counts > 0
+    table[seen] = np.log10(counts[seen] / total)
+    return table.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a quadgram table from English text")
+    parser.add_argument('corpus', nargs='*', help="plain-text corpus files")
+    parser.add_argument('--python-docs', action='store_true', help="also count the pydoc topic pages")
+    parser.add_argument('-o', '--output', default='quadgrams.npy')
+    args = parser.parse_args()
+
+    counts = np.zeros(SIZE, dtype=np.int64)
+    for path in args.corpus:
+        count_file(path, counts)
+    if args.python_docs:
+        count_text(python_docs_text(), counts)
+
+    np.save(args.output, build_table(counts))
+    print(f"Wrote {args.output}: {int(counts.sum()):,} quadgrams, {int((counts > 0).sum()):,} distinct")
+
+
+if __name__ == "__main__":
+    main()
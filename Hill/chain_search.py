@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Beam search over chains of transforms (reverse -> atbash -> caesar ...).
+
+Each level expands every state in the beam with every transform in
+transforms.TRANSFORMS. Children are hashed by their text, so a state reached
+by two different chains (or undone by an inverse transform) is never expanded
+twice. Children are scored by quadgram fitness and the best `beam` go on to
+the next level. Expansion is spread across a process pool.
+"""
+import argparse
+import hashlib
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from cipher_engine import PreparedText, add_ciphertext_arguments, add_workers_argument, read_ciphertext
+from ngram_score import default_scorer
+from transforms import TRANSFORMS
+
+
+def text_digest(text):
+    """Compact fingerprint of a state's text for the seen set"""
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+
+
+def expand(states, transforms=None, expected_letters=None):
+    """
+    Apply every transform to every (chain, text) state.
+    Returns [(digest, fitness, chain, text)] for all children.
+    """
+    transforms = transforms or list(TRANSFORMS)
+    scorer = default_scorer()
+    children = []
+    for chain, text in states:
+        for name in transforms:
+            child = TRANSFORMS[name](text)
+            children.append((text_digest(child), chain + (name,), child))
+    fitness = scorer.score_many([child for _, _, child in children], True, expected_letters)
+    return [(digest, float(score), chain, child)
+            for (digest, chain, child), score in zip(children, fitness)]
+
+
+def _split(items, parts):
+    size = -(-len(items) // parts)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def chain_search(text, depth=3, beam=50, top=10, workers=None, transforms=None):
+    """
+    Search transform chains up to `depth` long.
+    Returns [(fitness, chain, text)] for the best `top` states seen.
+    """
+    workers = workers or os.cpu_count() or 1
+    seen = {text_digest(text)}
+    scorer = default_scorer()
+    # Score against the input's letter count so dropping letters never helps
+    letters = len(PreparedText(text))
+    best = [(scorer.fitness(text), (), text)]
+    frontier = [((), text)]
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for _ in range(depth):
+            if not frontier:
+                break
+            if pool:
+                batches = pool.map(expand, _split(frontier, workers), [transforms] * workers, [letters] * workers)
+                children = [child for batch in batches for child in batch]
+            else:
+                children = expand(frontier, transforms, letters)
+
+            fresh = []
+            for digest, fitness, chain, child in children:
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                fresh.append((fitness, chain, child))
+
+            frontier = [(chain, child) for _, chain, child in
+                        heapq.nlargest(beam, fresh, key=lambda state: state[0])]
+            best = heapq.nlargest(top, best + fresh, key=lambda state: state[0])
+    finally:
+        if pool:
+            pool.shutdown()
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search chains of classical transforms")
+    add_ciphertext_arguments(parser)
+    parser.add_argument('-d', '--depth', type=int, default=3)
+    parser.add_argument('-b', '--beam', type=int, default=50)
+    parser.add_argument('-n', '--top', type=int, default=10)
+    add_workers_argument(parser)
+    parser.add_argument('-t', '--transforms', nargs='+', choices=sorted(TRANSFORMS),
+                        help="restrict the search to these transforms")
+    args = parser.parse_args()
+
+    text = read_ciphertext(args)
+
+    for fitness, chain, result in chain_search(text, args.depth, args.beam, args.top,
+                                               args.workers, args.transforms):
+        print(f"{' -> '.join(chain) or '(none)':40} (fitness {fitness:.2f}): {result[:80]}")
+
+
+if __name__ == "__main__":
+    main()
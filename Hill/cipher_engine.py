@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Table-driven classical cipher engine shared by the Hill/ scripts.
+
+Monoalphabetic ciphers (Caesar/ROT-n, Atbash, arbitrary substitution) are a
+single str.translate with a table built once. Periodic ciphers (Vigenere)
+run over a NumPy uint8 view of the text. Only ASCII letters are changed; case
+is preserved and everything else passes through untouched.
+
+The command-line and process-pool plumbing the solver scripts share is at
+the end of this file.
+"""
+import string
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import numpy as np
+
+UPPER = string.ascii_uppercase
+LOWER = string.ascii_lowercase
+DEFAULT_CIPHERTEXT = "Eztjrhfnokdjrd,fdobiqhhohtflz."
+
+
+def _rotate(alphabet, shift):
+    """Rotate an alphabet left by shift positions"""
+    shift %= len(alphabet)
+    return alphabet[shift:] + alphabet[:shift]
+
+
+def substitution_table(cipher_alphabet):
+    """Build a translate table mapping cipher_alphabet[i] back to A+i"""
+    cipher_alphabet = cipher_alphabet.upper()
+    if sorted(cipher_alphabet) != list(UPPER):
+        raise ValueError("Cipher alphabet must be a permutation of A-Z")
+    return str.maketrans(cipher_alphabet + cipher_alphabet.lower(), UPPER + LOWER)
+
+
+# Decryption tables for every Caesar shift, built once at import
+CAESAR_TABLES = [str.maketrans(UPPER + LOWER, _rotate(UPPER, -shift) + _rotate(LOWER, -shift))
+                 for shift in range(26)]
+ATBASH_TABLE = str.maketrans(UPPER + LOWER, UPPER[::-1] + LOWER[::-1])
+
+
+def caesar_decrypt(text, shift):
+    """Decrypt text using Caesar cipher with given shift"""
+    return text.translate(CAESAR_TABLES[shift % 26])
+
+
+def caesar_encrypt(text, shift):
+    """Encrypt text using Caesar cipher with given shift (ROT-n)"""
+    return text.translate(CAESAR_TABLES[-shift % 26])
+
+
+def caesar_all_shifts(text):
+    """Decrypt text with all 26 Caesar shifts, index i holds shift i"""
+    return [text.translate(table) for table in CAESAR_TABLES]
+
+
+def atbash(text):
+    """Apply Atbash cipher (A=Z, B=Y, etc.)"""
+    return text.translate(ATBASH_TABLE)
+
+
+def substitution_decrypt(text, cipher_alphabet):
+    """Decrypt a monoalphabetic substitution given its cipher alphabet"""
+    return text.translate(substitution_table(cipher_alphabet))
+
+
+def key_shifts(key):
+    """Turn a Vigenere key into an array of shifts (A=0 ... Z=25)"""
+    shifts = [ord(c) - ord('A') for c in key.upper() if c in UPPER]
+    if not shifts:
+        raise ValueError(f"Key {key!r} has no letters")
+    return np.array(shifts, dtype=np.uint8)
+
+
+class PreparedText:
+    """
+    Text decoded once into a uint8 buffer plus the positions and values
+    (0-25) of its ASCII letters, so many keys can be applied cheaply
+    """
+
+    def __init__(self, text):
+        self.buffer = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+        upper = (self.buffer >= ord('A')) & (self.buffer <= ord('Z'))
+        lower = (self.buffer >= ord('a')) & (self.buffer <= ord('z'))
+        self.positions = np.flatnonzero(upper | lower)
+        self.base = np.where(lower[self.positions], ord('a'), ord('A')).astype(np.uint8)
+        self.values = self.buffer[self.positions] - self.base
+
+    def __len__(self):
+        return len(self.positions)
+
+    def apply(self, shifts):
+        """Subtract a repeating shift sequence from the letters, skipping non-letters"""
+        shifts = np.asarray(shifts, dtype=np.uint8) % 26
+        # np.tile is far faster than np.resize for a short repeating key
+        stream = np.tile(shifts, -(-len(self.positions) // len(shifts)))[:len(self.positions)]
+        out = self.buffer.copy()
+        out[self.positions] = (self.values + 26 - stream) % 26 + self.base
+        return out.tobytes().decode('utf-8')
+
+
+def periodic_decrypt(text, shifts):
+    """Decrypt with a repeating sequence of Caesar shifts (Vigenere/Beaufort-style key stream)"""
+    if isinstance(text, PreparedText):
+        return text.apply(shifts)
+    return PreparedText(text).apply(shifts)
+
+
+def vigenere_decrypt(text, key):
+    """Decrypt text using Vigenere cipher with given key"""
+    return periodic_decrypt(text, key_shifts(key))
+
+
+def vigenere_encrypt(text, key):
+    """Encrypt text using Vigenere cipher with given key"""
+    return periodic_decrypt(text, (26 - key_shifts(key)) % 26)
+
+
+def vigenere_decrypt_many(text, keys):
+    """Decrypt text with every key in keys, sharing the letter scan between them"""
+    prepared = text if isinstance(text, PreparedText) else PreparedText(text)
+    return [prepared.apply(key_shifts(key)) for key in keys]
+
+
+def add_ciphertext_arguments(parser):
+    """-c/--ciphertext and -f/--file"""
+    parser.add_argument('-c', '--ciphertext', default=DEFAULT_CIPHERTEXT)
+    parser.add_argument('-f', '--file', help="read the ciphertext from a file instead")
+
+
+def read_ciphertext(args):
+    """The ciphertext chosen by add_ciphertext_arguments' options"""
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as f:
+            return f.read()
+    return args.ciphertext
+
+
+def add_workers_argument(parser):
+    parser.add_argument('-w', '--workers', type=int, default=None, help="default: all cores")
+
+
+def submit_bounded(pool, fn, items, limit, *args):
+    """
+    pool.submit(fn, item, *args) for every item, yielding futures as they
+    finish. At most `limit` are in flight and items is read lazily, so a long
+    input never piles up as queued tasks.
+    """
+    pending = set()
+    for item in items:
+        pending.add(pool.submit(fn, item, *args))
+        if len(pending) >= limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from done
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        yield from done
@@ -1,48 +1,19 @@
 #!/usr/bin/env python3
 
+from cipher_engine import atbash, caesar_encrypt, substitution_decrypt, UPPER
+from substitution_solver import solve_substitution
+
 def atbash_decrypt(text):
     """Atbash cipher: A=Z, B=Y, C=X, etc."""
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                result += chr(ord('Z') - (ord(char) - ord('A')))
-            else:
-                result += chr(ord('z') - (ord(char) - ord('a')))
-        else:
-            result += char
-    return result
+    return atbash(text)
 
 def simple_substitution(text, shift=13):
     """ROT13 or other simple rotation"""
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                result += chr((ord(char) - ord('A') + shift) % 26 + ord('A'))
-            else:
-                result += chr((ord(char) - ord('a') + shift) % 26 + ord('a'))
-        else:
-            result += char
-    return result
+    return caesar_encrypt(text, shift)
 
 def reverse_alphabet_map(text):
     """Try mapping where the alphabet is reversed"""
-    normal = "abcdefghijklmnopqrstuvwxyz"
-    reversed_alpha = "zyxwvutsrqponmlkjihgfedcba"
-    
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.islower():
-                idx = normal.index(char)
-                result += reversed_alpha[idx]
-            else:
-                idx = normal.upper().index(char)
-                result += reversed_alpha[idx].upper()
-        else:
-            result += char
-    return result
+    return substitution_decrypt(text, UPPER[::-1])
 
 encrypted_message = "Eztjrhfnokdjrd,fdobiqhhohtflz."
 
@@ -65,15 +36,7 @@ print(f"Reverse alphabet: {reverse_result}")
 
 # Let's also manually check what ROT13 gives us:
 # E -> R, z -> m, t -> g, j -> w, r -> e, h -> u, f -> s, n -> a, o -> b, k -> x, d -> q, j -> w, r -> e, d -> q
-rot13_manual = ""
-for char in encrypted_message:
-    if char.isalpha():
-        if char.isupper():
-            rot13_manual += chr((ord(char) - ord('A') + 13) % 26 + ord('A'))
-        else:
-            rot13_manual += chr((ord(char) - ord('a') + 13) % 26 + ord('a'))
-    else:
-        rot13_manual += char
+rot13_manual = caesar_encrypt(encrypted_message, 13)
 
 print(f"ROT13 manual: {rot13_manual}")
 
@@ -88,3 +51,9 @@ print("\nBackward rotations:")
 for i in [1, 7, 8, 11, 12, 15, 19, 25]:
     rot_result = simple_substitution(encrypted_message, -i)
     print(f"ROT-{i:2}: {rot_result}")
+
+# General substitution alphabet, found by hill climbing on quadgram fitness
+if __name__ == "__main__":
+    print("\nGeneral substitution:")
+    score, alphabet, plaintext = solve_substitution(encrypted_message, restarts=16, log=None)
+    print(f"Alphabet {alphabet} (fitness {score:.2f}): {plaintext}")
@@ -1,40 +1,9 @@
 #!/usr/bin/env python3
 
-def caesar_cipher_decrypt(text, shift):
-    """Decrypt text using Caesar cipher with given shift"""
-    result = ""
-    for char in text:
-        if char.isalpha():
-            # Preserve case
-            if char.isupper():
-                result += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            else:
-                result += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-        else:
-            result += char
-    return result
-
-def vigenere_decrypt(text, key):
-    """Decrypt text using Vigenere cipher with given key"""
-    result = ""
-    key = key.upper()
-    key_index = 0
-    
-    for char in text:
-        if char.isalpha():
-            # Get the shift value from the key
-            shift = ord(key[key_index % len(key)]) - ord('A')
-            
-            if char.isupper():
-                result += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            else:
-                result += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-            
-            key_index += 1
-        else:
-            result += char
-    
-    return result
+from cipher_engine import caesar_all_shifts
+from hill_cipher import crack_2x2
+from ngram_score import default_scorer
+from vigenere_solver import estimate_period, solve_vigenere
 
 def analyze_frequency(text):
     """Basic frequency analysis"""
@@ -44,6 +13,8 @@ def analyze_frequency(text):
             freq[char] = freq.get(char, 0) + 1
     return freq
 
+scorer = default_scorer()
+
 # The encrypted message
 encrypted_message = "Eztjrhfnokdjrd,fdobiqhhohtflz."
 
@@ -51,34 +22,27 @@ print("Encrypted message:", encrypted_message)
 print("Length:", len(encrypted_message.replace(',', '').replace('.', '')))
 print("=" * 50)
 
-# Try Caesar cipher with different shifts
+# Try Caesar cipher with different shifts, most English-like first
 print("=== Caesar Cipher Analysis ===")
-for shift in range(1, 26):
-    decrypted = caesar_cipher_decrypt(encrypted_message, shift)
-    print(f"Shift {shift:2d}: {decrypted}")
+shifts = list(enumerate(caesar_all_shifts(encrypted_message)))[1:]
+for shift, decrypted in scorer.rank(shifts, key=lambda candidate: candidate[1], top=5):
+    print(f"Shift {shift:2d} (fitness {scorer.fitness(decrypted):.2f}): {decrypted}")
 
 print("=" * 50)
 
-# Try Vigenere with various keys related to "House on Haunted Hill"
-keys_to_try = [
-    "HILL", 
-    "HAUNTED", 
-    "HOUSE", 
-    "GHOST", 
-    "SPIRIT", 
-    "SCARY", 
-    "HORROR",
-    "VINCENT",  # Vincent Price was in the movie
-    "PRICE",
-    "SKELETON",
-    "DEATH",
-    "FEAR"
-]
-
+# Recover the Vigenere key from the ciphertext itself instead of guessing
 print("=== Vigenere Cipher Analysis ===")
-for key in keys_to_try:
-    vigenere_result = vigenere_decrypt(encrypted_message, key)
-    print(f"Key '{key}': {vigenere_result}")
+for period, ioc, kasiski in estimate_period(encrypted_message)[:5]:
+    print(f"Period {period:2d}: IoC {ioc:.4f}, Kasiski {kasiski:.2%}")
+for key, score, vigenere_result in solve_vigenere(encrypted_message):
+    print(f"Key '{key}' (chi2 {score:.1f}): {vigenere_result}")
+
+print("=" * 50)
+
+# Try a 2x2 Hill matrix over every invertible key
+print("=== Hill Cipher Analysis ===")
+for fitness, key, hill_result in crack_2x2(encrypted_message, top=3):
+    print(f"Key {key.tolist()} (fitness {fitness:.2f}): {hill_result}")
 
 print("=" * 50)
 
@@ -1,97 +1,23 @@
 #!/usr/bin/env python3
 
-def atbash_cipher(text):
-    """Apply Atbash cipher (A=Z, B=Y, etc.)"""
-    result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                result += chr(ord('Z') - (ord(char) - ord('A')))
-            else:
-                result += chr(ord('z') - (ord(char) - ord('a')))
-        else:
-            result += char
-    return result
-
-def reverse_text(text):
-    """Simple reverse of the text"""
-    return text[::-1]
-
-def keyboard_shift(text, shift_type='qwerty'):
-    """Try keyboard shift patterns"""
-    if shift_type == 'qwerty':
-        # QWERTY keyboard layout shift
-        qwerty_map = {
-            'q': 'w', 'w': 'e', 'e': 'r', 'r': 't', 't': 'y', 'y': 'u', 'u': 'i', 'i': 'o', 'o': 'p',
-            'a': 's', 's': 'd', 'd': 'f', 'f': 'g', 'g': 'h', 'h': 'j', 'j': 'k', 'k': 'l',
-            'z': 'x', 'x': 'c', 'c': 'v', 'v': 'b', 'b': 'n', 'n': 'm'
-        }
-        # Create reverse mapping
-        qwerty_reverse = {v: k for k, v in qwerty_map.items()}
-        
-        result = ""
-        for char in text.lower():
-            if char in qwerty_reverse:
-                result += qwerty_reverse[char]
-            else:
-                result += char
-        return result
-    return text
-
-def rail_fence_decrypt(text, rails):
+from cipher_engine import atbash as atbash_cipher, caesar_all_shifts, caesar_encrypt
+from keyboard_layouts import decode_all
+from ngram_score import default_scorer
+import rail_fence
+from transforms import keyboard_shift, reverse_text
+
+def rail_fence_decrypt(text, rails, offset=0):
     """Decrypt rail fence cipher"""
     # Remove non-alphabetic characters for rail fence
     clean_text = ''.join(c for c in text if c.isalpha())
-    
-    if rails == 1:
-        return clean_text
-    
-    # Create the rail fence pattern
-    fence = [['\n' for j in range(len(clean_text))] for i in range(rails)]
-    
-    # Mark the places in the fence
-    rail = 0
-    direction = False
-    for i in range(len(clean_text)):
-        fence[rail][i] = '*'
-        if rail == 0 or rail == rails - 1:
-            direction = not direction
-        rail += 1 if direction else -1
-    
-    # Fill the fence with the encoded text
-    index = 0
-    for i in range(rails):
-        for j in range(len(clean_text)):
-            if fence[i][j] == '*' and index < len(clean_text):
-                fence[i][j] = clean_text[index]
-                index += 1
-    
-    # Read the fence to get the original text
-    result = []
-    rail = 0
-    direction = False
-    for i in range(len(clean_text)):
-        result.append(fence[rail][i])
-        if rail == 0 or rail == rails - 1:
-            direction = not direction
-        rail += 1 if direction else -1
-    
-    return ''.join(result)
+    return rail_fence.decrypt(clean_text, rails, offset)
 
 def simple_substitution_analysis(text):
     """Try some common simple substitutions"""
     # ROT13
-    rot13_result = ""
-    for char in text:
-        if char.isalpha():
-            if char.isupper():
-                rot13_result += chr((ord(char) - ord('A') + 13) % 26 + ord('A'))
-            else:
-                rot13_result += chr((ord(char) - ord('a') + 13) % 26 + ord('a'))
-        else:
-            rot13_result += char
-    
-    return rot13_result
+    return caesar_encrypt(text, 13)
+
+scorer = default_scorer()
 
 # The encrypted message
 encrypted_message = "Eztjrhfnokdjrd,fdobiqhhohtflz."
@@ -125,6 +51,12 @@ print("=== Keyboard Shift ===")
 keyboard_result = keyboard_shift(encrypted_message)
 print(f"QWERTY shift: {keyboard_result}")
 
+# Every layout, direction and distance, most English-like first
+keyboard_results = decode_all(encrypted_message)
+letter_count = sum(c.isalpha() for c in encrypted_message)
+for layout, direction, distance in scorer.rank(keyboard_results, keyboard_results.get, 5, letter_count):
+    print(f"{layout} {direction} {distance}: {keyboard_results[layout, direction, distance]}")
+
 print()
 
 # Try rail fence with different rail counts
@@ -133,6 +65,11 @@ for rails in range(2, 6):
     rail_result = rail_fence_decrypt(encrypted_message, rails)
     print(f"Rails {rails}: {rail_result}")
 
+# Every rail count and starting offset, best fitness first
+clean_message = ''.join(c for c in encrypted_message if c.isalpha())
+for fitness, rails, offset, rail_result in rail_fence.search(clean_message, top=3):
+    print(f"Rails {rails} offset {offset} (fitness {fitness:.2f}): {rail_result}")
+
 print()
 
 # Let's also try looking at it as two separate words
@@ -143,29 +80,11 @@ print(f"Part 2: {parts[1]}")
 
 # Try Caesar on each part separately
 print("\n--- Caesar on Part 1 ---")
-for shift in range(1, 26):
-    decrypted = ""
-    for char in parts[0]:
-        if char.isalpha():
-            if char.isupper():
-                decrypted += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            else:
-                decrypted += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-        else:
-            decrypted += char
-    if 'the' in decrypted.lower() or 'and' in decrypted.lower() or 'you' in decrypted.lower():
-        print(f"Shift {shift:2d}: {decrypted}")
+shifts = list(enumerate(caesar_all_shifts(parts[0])))[1:]
+for shift, decrypted in scorer.rank(shifts, key=lambda candidate: candidate[1], top=3):
+    print(f"Shift {shift:2d} (fitness {scorer.fitness(decrypted):.2f}): {decrypted}")
 
 print("\n--- Caesar on Part 2 ---")
-for shift in range(1, 26):
-    decrypted = ""
-    for char in parts[1]:
-        if char.isalpha():
-            if char.isupper():
-                decrypted += chr((ord(char) - ord('A') - shift) % 26 + ord('A'))
-            else:
-                decrypted += chr((ord(char) - ord('a') - shift) % 26 + ord('a'))
-        else:
-            decrypted += char
-    if 'the' in decrypted.lower() or 'and' in decrypted.lower() or 'you' in decrypted.lower():
-        print(f"Shift {shift:2d}: {decrypted}")
+shifts = list(enumerate(caesar_all_shifts(parts[1])))[1:]
+for shift, decrypted in scorer.rank(shifts, key=lambda candidate: candidate[1], top=3):
+    print(f"Shift {shift:2d} (fitness {scorer.fitness(decrypted):.2f}): {decrypted}")
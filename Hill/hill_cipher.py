@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Hill (matrix) cipher: encryption, decryption and key recovery.
+
+Letters are taken in blocks of n and encrypted as C = K.P (mod 26) with
+column vectors. Non-letters and case are kept in place. Any trailing letters
+that do not fill a block are left unchanged.
+
+Attacks:
+  * recover_key: known-plaintext, solves K = C.P^-1 (mod 26)
+  * crack_2x2:   ciphertext-only, tries all 157,248 invertible 2x2
+                 decryption matrices as NumPy batches
+  * crack_3x3:   ciphertext-only, scores each of the 26**3 candidate rows of
+                 the decryption matrix on its own (a row fixes one letter of
+                 every block), then combines the best rows
+Candidates are ranked by quadgram fitness.
+"""
+import argparse
+import itertools
+from math import gcd
+
+import numpy as np
+
+from cipher_engine import PreparedText, add_ciphertext_arguments, read_ciphertext
+from ngram_score import default_scorer
+from vigenere_solver import chi_squared
+
+BATCH = 8192
+ROW_CELLS = 1 << 22  # letters computed at once when rating 3x3 rows
+
+
+def _determinant(matrix):
+    """Exact integer determinant (Bareiss elimination)"""
+    m = [list(map(int, row)) for row in matrix]
+    n = len(m)
+    sign, previous = 1, 1
+    for k in range(n - 1):
+        if m[k][k] == 0:
+            swap = next((i for i in range(k + 1, n) if m[i][k]), None)
+            if swap is None:
+                return 0
+            m[k], m[swap] = m[swap], m[k]
+            sign = -sign
+        for i in range(k + 1, n):
+            for j in range(k + 1, n):
+                m[i][j] = (m[i][j] * m[k][k] - m[i][k] * m[k][j]) // previous
+        previous = m[k][k]
+    return sign * m[n - 1][n - 1]
+
+
+def matrix_inverse_mod26(matrix):
+    """Inverse of a square matrix mod 26, raising ValueError if it has none"""
+    matrix = np.asarray(matrix, dtype=np.int64) % 26
+    n = len(matrix)
+    det = _determinant(matrix) % 26
+    if gcd(det, 26) != 1:
+        raise ValueError(f"Matrix is not invertible mod 26 (det {det})")
+    if n == 1:
+        return np.array([[pow(det, -1, 26)]], dtype=np.int64)
+    adjugate = np.empty_like(matrix)
+    for i in range(n):
+        for j in range(n):
+            minor = np.delete(np.delete(matrix, i, axis=0), j, axis=1)
+            adjugate[j, i] = (-1) ** (i + j) * _determinant(minor)
+    return (pow(det, -1, 26) * adjugate) % 26
+
+
+def is_invertible(matrix):
+    return gcd(_determinant(np.asarray(matrix) % 26) % 26, 26) == 1
+
+
+def _blocks(values, n):
+    """Letter values as an (n, blocks) matrix of column vectors, dropping the tail"""
+    usable = len(values) - len(values) % n
+    return values[:usable].reshape(-1, n).T.astype(np.int64)
+
+
+def _rebuild(prepared, letters):
+    """Put transformed letter values back into the text, keeping case and punctuation"""
+    values = prepared.values.copy()
+    values[:len(letters)] = letters
+    out = prepared.buffer.copy()
+    out[prepared.positions] = values + prepared.base
+    return out.tobytes().decode('utf-8')
+
+
+def hill_encrypt(text, key):
+    """Encrypt text with a Hill key matrix"""
+    key = np.asarray(key, dtype=np.int64) % 26
+    prepared = PreparedText(text)
+    blocks = _blocks(prepared.values, len(key))
+    return _rebuild(prepared, ((key @ blocks) % 26).T.ravel())
+
+
+def hill_decrypt(text, key):
+    """Decrypt text with a Hill key matrix (the encryption matrix)"""
+    return hill_encrypt(text, matrix_inverse_mod26(key))
+
+
+def _rank_mod(vectors, p):
+    """Rank of a list of vectors mod the prime p"""
+    rows = [[int(v) % p for v in vector] for vector in vectors]
+    rank = 0
+    for col in range(len(rows[0]) if rows else 0):
+        pivot = next((r for r in range(rank, len(rows)) if rows[r][col]), None)
+        if pivot is None:
+            continue
+        rows[rank], rows[pivot] = rows[pivot], rows[rank]
+        inverse = pow(rows[rank][col], -1, p)
+        for r in range(rank + 1, len(rows)):
+            factor = rows[r][col] * inverse
+            rows[r] = [(a - factor * b) % p for a, b in zip(rows[r], rows[rank])]
+        rank += 1
+    return rank
+
+
+def recover_key(plaintext, ciphertext, n=2):
+    """
+    Known-plaintext attack: find the n x n encryption matrix mapping
+    plaintext to ciphertext. Needs n plaintext blocks that form an
+    invertible matrix; they are picked greedily, a block joining only if it
+    keeps the chosen ones independent mod 2 and mod 13. Those n blocks fix
+    the key, so if it doesn't reproduce the ciphertext, no other set will.
+    """
+    plain = _blocks(PreparedText(plaintext).values, n)
+    cipher = _blocks(PreparedText(ciphertext).values, n)
+    count = min(plain.shape[1], cipher.shape[1])
+    columns = []
+    for column in range(count):
+        candidate = [plain[:, c] for c in columns + [column]]
+        if _rank_mod(candidate, 2) == len(candidate) == _rank_mod(candidate, 13):
+            columns.append(column)
+            if len(columns) == n:
+                break
+    else:
+        raise ValueError(f"No {n} plaintext blocks form an invertible matrix")
+    key = (cipher[:, columns] @ matrix_inverse_mod26(plain[:, columns])) % 26
+    if not np.array_equal((key @ plain[:, :count]) % 26, cipher[:, :count]):
+        raise ValueError("The key fixed by the plaintext doesn't reproduce the ciphertext")
+    return key
+
+
+def invertible_2x2():
+    """All 157,248 invertible 2x2 matrices mod 26, shape (N, 2, 2)"""
+    a, b, c, d = (axis.ravel() for axis in np.indices((26, 26, 26, 26)))
+    det = (a * d - b * c) % 26
+    keep = (det % 2 == 1) & (det % 13 != 0)
+    return np.stack([a[keep], b[keep], c[keep], d[keep]], axis=1).reshape(-1, 2, 2)
+
+
+def _batch_decrypt(matrices, blocks):
+    """Apply every matrix to the blocks; returns letter values, shape (N, letters)"""
+    plain = np.einsum('kij,jm->kmi', matrices, blocks) % 26
+    return plain.reshape(len(matrices), -1)
+
+
+def _rank(text, decrypt_matrices, top):
+    """[(fitness, encryption key, plaintext)] for the given decryption matrices"""
+    scorer = default_scorer()
+    results = []
+    for matrix in decrypt_matrices:
+        plaintext = hill_encrypt(text, matrix)
+        results.append((scorer.fitness(plaintext), matrix_inverse_mod26(matrix), plaintext))
+    results.sort(key=lambda result: result[0], reverse=True)
+    return results[:top]
+
+
+def crack_2x2(text, top=10, sample=120):
+    """
+    Ciphertext-only attack on a 2x2 Hill cipher. Every invertible matrix is
+    scored on the first `sample` letters, and the best are re-scored on the
+    full text.
+    """
+    scorer = default_scorer()
+    blocks = _blocks(PreparedText(text).values[:sample], 2)
+    matrices = invertible_2x2()
+    scores = np.empty(len(matrices))
+    for start in range(0, len(matrices), BATCH):
+        batch = matrices[start:start + BATCH]
+        scores[start:start + BATCH] = scorer.score_values(_batch_decrypt(batch, blocks))
+    best = np.argsort(-scores)[:max(top * 4, top)]
+    return _rank(text, matrices[best], top)
+
+
+def crack_3x3(text, top=10, rows=20, sample=300):
+    """
+    Ciphertext-only attack on a 3x3 Hill cipher. Each candidate decryption
+    row is rated by the chi-squared of the letters it produces, then ordered
+    triples of the best `rows` rows are scored as full matrices on the first
+    `sample` letters and the best re-scored on the full text.
+    """
+    blocks = _blocks(PreparedText(text).values, 3)
+    if blocks.shape[1] < 3:
+        raise ValueError("Need at least 9 letters for a 3x3 attack")
+    candidates = np.indices((26, 26, 26)).reshape(3, -1).T
+    # Rows in chunks, so the letters array stays around ROW_CELLS entries whatever the text length
+    chunk = max(1, ROW_CELLS // blocks.shape[1])
+    counts = np.empty((len(candidates), 26), dtype=np.int64)
+    for start in range(0, len(candidates), chunk):
+        rows_chunk = candidates[start:start + chunk]
+        letters = (rows_chunk @ blocks) % 26
+        index = np.arange(len(rows_chunk))[:, None] * 26 + letters
+        counts[start:start + chunk] = np.bincount(index.ravel(), minlength=len(rows_chunk) * 26).reshape(-1, 26)
+    best_rows = candidates[np.argsort(chi_squared(counts))[:rows]]
+
+    matrices = [np.array(triple) for triple in itertools.permutations(best_rows, 3)
+                if is_invertible(np.array(triple))]
+    if not matrices:
+        return []
+    matrices = np.array(matrices)
+    scorer = default_scorer()
+    sample_blocks = blocks[:, :max(sample // 3, 1)]
+    scores = np.empty(len(matrices))
+    for start in range(0, len(matrices), BATCH):
+        batch = matrices[start:start + BATCH]
+        scores[start:start + BATCH] = scorer.score_values(_batch_decrypt(batch, sample_blocks))
+    best = np.argsort(-scores)[:max(top * 4, top)]
+    return _rank(text, matrices[best], top)
+
+
+def _format(matrix):
+    return ' '.join('[' + ' '.join(f"{v:2d}" for v in row) + ']' for row in np.asarray(matrix))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hill cipher key recovery")
+    add_ciphertext_arguments(parser)
+    parser.add_argument('-p', '--plaintext', help="known plaintext (crib) for key recovery")
+    parser.add_argument('-n', '--size', type=int, choices=(2, 3), default=None,
+                        help="matrix size (default: try 2 and 3)")
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    text = read_ciphertext(args)
+
+    if args.plaintext:
+        key = recover_key(args.plaintext, text, args.size or 2)
+        print(f"Key {_format(key)}: {hill_decrypt(text, key)}")
+        return
+
+    for size, attack in ((2, crack_2x2), (3, crack_3x3)):
+        if args.size and args.size != size:
+            continue
+        print(f"=== {size}x{size} Hill Cipher ===")
+        for fitness, key, plaintext in attack(text, args.top):
+            print(f"Key {_format(key)} (fitness {fitness:.2f}): {plaintext[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Keyboard shift decoding for QWERTY, AZERTY, Dvorak and Colemak.
+
+A "right 2" variant means every key was typed two positions to the right of
+the intended one; decoding maps it back. Up/down move between rows using
+the same column index. Rows are the unshifted number row (digits for every
+layout) plus the three letter rows. Characters with no key at the target
+position are left alone and case is kept.
+
+Every variant's str.translate table is built once at import, so decoding all
+48 variants of a text is 48 translate calls.
+"""
+
+LAYOUTS = {
+    'qwerty': ["1234567890-=", "qwertyuiop[]", "asdfghjkl;'", "zxcvbnm,./"],
+    'azerty': ["1234567890)=", "azertyuiop^$", "qsdfghjklmù*", "wxcvbn,;:!"],
+    'dvorak': ["1234567890[]", "',.pyfgcrl/=", "aoeuidhtns-", ";qjkxbmwvz"],
+    'colemak': ["1234567890-=", "qwfpgjluy;[]", "arstdhneio'", "zxcvbkm,./"],
+}
+DIRECTIONS = {'left': (0, -1), 'right': (0, 1), 'up': (-1, 0), 'down': (1, 0)}
+DISTANCES = (1, 2, 3)
+
+
+def _key_at(rows, row, col):
+    if 0 <= row < len(rows) and 0 <= col < len(rows[row]):
+        return rows[row][col]
+    return None
+
+
+def _shift_map(rows, direction, distance):
+    """typed key -> intended key for one layout/direction/distance"""
+    d_row, d_col = DIRECTIONS[direction]
+    mapping = {}
+    for row, keys in enumerate(rows):
+        for col, intended in enumerate(keys):
+            typed = _key_at(rows, row + d_row * distance, col + d_col * distance)
+            if typed is not None:
+                mapping[typed] = intended
+    return mapping
+
+
+def _translate_table(mapping):
+    """str.translate table that also handles upper-case letters"""
+    table = {}
+    for typed, intended in mapping.items():
+        table[ord(typed)] = intended
+        if typed.isalpha():
+            table[ord(typed.upper())] = intended.upper()
+    return table
+
+
+def _build_tables():
+    decode, encode = {}, {}
+    for layout, rows in LAYOUTS.items():
+        for direction in DIRECTIONS:
+            for distance in DISTANCES:
+                mapping = _shift_map(rows, direction, distance)
+                decode[layout, direction, distance] = _translate_table(mapping)
+                encode[layout, direction, distance] = _translate_table(
+                    {intended: typed for typed, intended in mapping.items()})
+    return decode, encode
+
+
+# (layout, direction, distance) -> translate table
+DECODE_TABLES, ENCODE_TABLES = _build_tables()
+
+
+def decode(text, layout='qwerty', direction='right', distance=1):
+    """Undo a keyboard shift"""
+    return text.translate(DECODE_TABLES[layout, direction, distance])
+
+
+def encode(text, layout='qwerty', direction='right', distance=1):
+    """Apply a keyboard shift (type every key `distance` keys over)"""
+    return text.translate(ENCODE_TABLES[layout, direction, distance])
+
+
+def decode_all(text, layouts=None):
+    """Decode text under every variant: {(layout, direction, distance): text}"""
+    return {variant: text.translate(table) for variant, table in DECODE_TABLES.items()
+            if layouts is None or variant[0] in layouts}
+
+
+if __name__ == "__main__":
+    import sys
+
+    from ngram_score import default_scorer
+
+    message = sys.argv[1] if len(sys.argv) > 1 else "Eztjrhfnokdjrd,fdobiqhhohtflz."
+    candidates = decode_all(message)
+    letters = sum(c.isalpha() for c in message)
+    for variant in default_scorer().rank(candidates, candidates.get, 10, letters):
+        layout, direction, distance = variant
+        print(f"{layout:8} {direction:5} {distance}: {candidates[variant]}")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Quadgram fitness scoring for ranking candidate plaintexts.
+
+The table is 26**4 float32 log10 probabilities in quadgrams.npy (built by
+build_quadgrams.py) and is memory-mapped rather than read, so importing this
+module is cheap and worker processes share the pages. Scores are sums of log
+probabilities: higher (closer to zero) is more English-like. Per-quadgram
+fitness is also available for comparing texts of different lengths.
+"""
+import os
+
+import numpy as np
+
+from cipher_engine import PreparedText
+
+QUADGRAM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'quadgrams.npy')
+
+
+def quadgram_ids(values):
+    """Index of every 4-letter window along the last axis of an array of 0-25 values"""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values[..., :-3] * 26 + values[..., 1:-2]) * 26 + values[..., 2:-1]) * 26 + values[..., 3:]
+
+
+class QuadgramScorer:
+    """Log-probability scorer over a memory-mapped quadgram table"""
+
+    def __init__(self, path=QUADGRAM_FILE):
+        self.table = np.load(path, mmap_mode='r')
+        if self.table.shape != (26 ** 4,):
+            raise ValueError(f"{path} is not a 26**4 quadgram table")
+        self.floor = float(self.table.min())
+
+    def score_values(self, values):
+        """Total log probability of letter values (0-25); 2-D input scores each row"""
+        values = np.asarray(values)
+        if values.shape[-1] < 4:
+            return np.zeros(values.shape[:-1]) if values.ndim > 1 else 0.0
+        return self.table[quadgram_ids(values)].sum(axis=-1, dtype=np.float64)
+
+    def score(self, text):
+        """Total log probability of the letters of text"""
+        return float(self.score_values(PreparedText(text).values))
+
+    def fitness(self, text):
+        """Average log probability per quadgram, comparable across lengths"""
+        values = PreparedText(text).values
+        if len(values) < 4:
+            return self.floor
+        return float(self.score_values(values)) / (len(values) - 3)
+
+    def score_many(self, texts, normalise=False, expected_letters=None):
+        """
+        Score a batch of texts with one table lookup. Texts may differ in
+        length; quadgrams never span two texts. With expected_letters, every
+        letter a text is short of that count is charged the floor score, so
+        transforms that turn letters into digits or symbols don't look better.
+        """
+        values = [PreparedText(text).values for text in texts]
+        lengths = np.array([len(v) for v in values])
+        scores = np.zeros(len(values))
+        if expected_letters is not None:
+            missing = np.maximum(expected_letters - lengths, 0)
+            if normalise:
+                if expected_letters < 4:
+                    return np.full(len(values), self.floor)  # no quadgrams to average, as below
+                return (self.score_many(texts) + missing * self.floor) / (expected_letters - 3)
+            return self.score_many(texts) + missing * self.floor
+        if not len(values) or lengths.max(initial=0) < 4:
+            return np.full(len(values), self.floor) if normalise else scores
+
+        joined = np.concatenate(values)
+        ids = quadgram_ids(joined)
+        logp = self.table[ids].astype(np.float64)
+        # Drop windows that would cross from one text into the next
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        window_counts = np.maximum(lengths - 3, 0)
+        owners = np.repeat(np.arange(len(values)), lengths)[:len(ids)]
+        valid = np.arange(len(ids)) - starts[owners] < window_counts[owners]
+        scores = np.bincount(owners[valid], weights=logp[valid], minlength=len(values))
+        if normalise:
+            return np.where(window_counts > 0, scores / np.maximum(window_counts, 1), self.floor)
+        return scores
+
+    def rank(self, candidates, key=None, top=None, expected_letters=None):
+        """
+        Sort candidates best first by per-quadgram fitness. key extracts the
+        text from each candidate (default: the candidate itself).
+        """
+        candidates = list(candidates)
+        texts = [key(c) for c in candidates] if key else candidates
+        order = np.argsort(-self.score_many(texts, True, expected_letters), kind='stable')
+        return [candidates[i] for i in order[:top]]
+
+
+_default = None
+
+
+def default_scorer():
+    """Shared scorer over the bundled quadgram table"""
+    global _default
+    if _default is None:
+        _default = QuadgramScorer()
+    return _default
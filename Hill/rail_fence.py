@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Rail fence transposition as index permutations.
+
+The zig-zag for (length, rails, offset) is turned into a permutation once
+and cached, so encrypting or decrypting is a single NumPy gather over the
+text's code points. Offset is how far into the zig-zag cycle the first
+character sits (0 starts on the top rail going down). search() sweeps every
+rail count and offset and ranks the results by quadgram fitness.
+"""
+import argparse
+from functools import lru_cache
+
+import numpy as np
+
+from cipher_engine import add_ciphertext_arguments, read_ciphertext
+from ngram_score import default_scorer
+
+
+def _rail_of(length, rails, offset):
+    """Rail index (0 = top) of every position of the zig-zag"""
+    cycle = 2 * (rails - 1)
+    phase = (np.arange(length, dtype=np.int64) + offset) % cycle
+    return np.where(phase < rails, phase, cycle - phase).astype(np.uint8 if rails <= 256 else np.int64)
+
+
+def build_permutation(length, rails, offset=0):
+    """
+    Ciphertext reading order: ciphertext[k] = plaintext[order[k]].
+    Rails are read top to bottom, each left to right.
+    """
+    if rails < 2 or length <= 1:
+        return np.arange(length, dtype=np.int64)
+    # Stable sort on the small rail values keeps positions in order within a rail
+    return np.argsort(_rail_of(length, rails, offset), kind='stable')
+
+
+@lru_cache(maxsize=64)
+def permutation(length, rails, offset=0):
+    """Cached (encrypt order, decrypt order) pair for (length, rails, offset)"""
+    order = build_permutation(length, rails, offset)
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(length)
+    order.flags.writeable = False
+    inverse.flags.writeable = False
+    return order, inverse
+
+
+def _code_points(text):
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _from_code_points(points):
+    return points.tobytes().decode('utf-32-le')
+
+
+def encrypt(text, rails, offset=0):
+    """Rail fence encrypt every character of text"""
+    order, _ = permutation(len(text), rails, offset)
+    return _from_code_points(_code_points(text)[order])
+
+
+def decrypt(text, rails, offset=0):
+    """Rail fence decrypt every character of text"""
+    _, inverse = permutation(len(text), rails, offset)
+    return _from_code_points(_code_points(text)[inverse])
+
+
+def search(text, max_rails=None, top=10, sample=400):
+    """
+    Try every rail count 2..max_rails and every starting offset. Each
+    candidate is scored on its first `sample` characters (a partial gather),
+    and the best are decrypted in full.
+    Returns [(fitness, rails, offset, plaintext)], best first.
+    """
+    scorer = default_scorer()
+    points = _code_points(text)
+    length = len(points)
+    max_rails = min(max_rails or 20, max(length - 1, 2))
+
+    candidates, samples = [], []
+    for rails in range(2, max_rails + 1):
+        for offset in range(2 * (rails - 1)):
+            order = build_permutation(length, rails, offset)
+            # plaintext[i] = ciphertext[inverse[i]], and inverse[:sample] only
+            # needs the positions of the first `sample` indices in order
+            inverse_head = np.flatnonzero(order < sample)
+            inverse_head = inverse_head[np.argsort(order[inverse_head])]
+            candidates.append((rails, offset))
+            samples.append(_from_code_points(points[inverse_head]))
+
+    fitness = scorer.score_many(samples, normalise=True)
+    best = np.argsort(-fitness, kind='stable')[:top]
+    results = []
+    for index in best:
+        rails, offset = candidates[index]
+        plaintext = _from_code_points(points[permutation(length, rails, offset)[1]])
+        results.append((scorer.fitness(plaintext), rails, offset, plaintext))
+    results.sort(key=lambda result: result[0], reverse=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rail fence brute force over rails and offsets")
+    add_ciphertext_arguments(parser)
+    parser.add_argument('--max-rails', type=int, default=20)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--letters-only', action='store_true',
+                        help="drop non-letters first, as crypto_solver2.py does")
+    args = parser.parse_args()
+
+    text = read_ciphertext(args)
+    if args.letters_only:
+        text = ''.join(c for c in text if c.isalpha())
+
+    for fitness, rails, offset, plaintext in search(text, args.max_rails, args.top):
+        print(f"Rails {rails:2d} offset {offset:2d} (fitness {fitness:.2f}): {plaintext[:80]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Streaming frequency and repeat analysis for large ciphertext files.
+
+The input (a file, memory-mapped, or stdin read in chunks) is reduced to its
+letters, case folded, as it streams. Counters for 1- to 5-grams are flat
+NumPy arrays of 26**n entries, so memory depends on max_n rather than the
+input size. The last few letters carry over between chunks so no n-gram
+is lost at a chunk boundary. For Kasiski, the last position of every trigram
+is kept. Each repeat adds its spacing to a bounded histogram and to a count
+of the periods it divides.
+"""
+import argparse
+import mmap
+import sys
+
+import numpy as np
+
+CHUNK = 1 << 22
+KASISKI_LENGTH = 3
+
+
+def letters_of(chunk):
+    """Letters of a bytes-like chunk as 0-25 values (ASCII, case folded)"""
+    buf = np.frombuffer(chunk, dtype=np.uint8) | 0x20
+    return (buf[(buf >= ord('a')) & (buf <= ord('z'))] - ord('a')).astype(np.int64)
+
+
+def gram_ids(values, n):
+    """Index of every n-letter window (base-26 number of its letters)"""
+    ids = values[:len(values) - n + 1].copy()
+    for offset in range(1, n):
+        ids *= 26
+        ids += values[offset:len(values) - n + 1 + offset]
+    return ids
+
+
+class StreamAnalyzer:
+    """Incremental n-gram counts and trigram repeat spacings"""
+
+    def __init__(self, max_n=5, max_period=20, max_spacing=1000):
+        self.max_n = max_n
+        self.counts = {n: np.zeros(26 ** n, dtype=np.int64) for n in range(1, max_n + 1)}
+        self.max_period = max_period
+        self.spacing_histogram = np.zeros(max_spacing + 1, dtype=np.int64)
+        self.period_votes = np.zeros(max_period + 1, dtype=np.int64)
+        self.repeats = 0
+        self._last_seen = np.full(26 ** KASISKI_LENGTH, -1, dtype=np.int64)
+        self._carry = np.zeros(0, dtype=np.int64)
+        self.letters = 0
+
+    def feed(self, chunk):
+        """Add a chunk of raw bytes"""
+        new = letters_of(chunk)
+        if not len(new):
+            return
+        values = np.concatenate([self._carry, new])
+        first = self.letters - len(self._carry)  # global index of values[0]
+
+        self.counts[1] += np.bincount(new, minlength=26)
+        for n in range(2, self.max_n + 1):
+            # Only windows that end in the new letters, so none is counted twice
+            start = max(len(self._carry) - n + 1, 0)
+            window = values[start:]
+            if len(window) >= n:
+                self.counts[n] += np.bincount(gram_ids(window, n), minlength=26 ** n)
+
+        start = max(len(self._carry) - KASISKI_LENGTH + 1, 0)
+        self._kasiski(gram_ids(values[start:], KASISKI_LENGTH), first + start)
+
+        self.letters += len(new)
+        self._carry = values[-(max(self.max_n, KASISKI_LENGTH) - 1):]
+
+    def _kasiski(self, ids, first_position):
+        if not len(ids):
+            return
+        # Trigram ids fit in uint16, where a stable argsort is a linear radix sort
+        ids = ids.astype(np.uint16)
+        order = np.argsort(ids, kind='stable')
+        sorted_ids, sorted_positions = ids[order], order + first_position
+        previous = np.empty_like(sorted_positions)
+        previous[1:] = sorted_positions[:-1]
+        starts_group = np.ones(len(ids), dtype=bool)
+        starts_group[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        # First occurrence in this chunk pairs with the last one from earlier chunks
+        previous[starts_group] = self._last_seen[sorted_ids[starts_group]]
+        ends_group = np.ones(len(ids), dtype=bool)
+        ends_group[:-1] = starts_group[1:]
+        self._last_seen[sorted_ids[ends_group]] = sorted_positions[ends_group]
+
+        spacings = (sorted_positions - previous)[previous >= 0]
+        self.repeats += len(spacings)
+        # Spacings within a chunk are bounded by its length, so an exact
+        # histogram of them gives every period's vote by slicing; only the
+        # rare longer gaps back to earlier chunks need a modulo pass
+        near = spacings[spacings <= len(ids)]
+        far = spacings[spacings > len(ids)]
+        histogram = np.bincount(near, minlength=len(self.spacing_histogram))
+        cap = len(self.spacing_histogram) - 1
+        self.spacing_histogram[:cap] += histogram[:cap]
+        self.spacing_histogram[cap] += histogram[cap:].sum()
+        self.spacing_histogram += np.bincount(np.minimum(far, cap), minlength=cap + 1)
+        for period in range(2, self.max_period + 1):
+            self.period_votes[period] += histogram[period::period].sum() + np.count_nonzero(far % period == 0)
+
+    def frequencies(self):
+        """{letter: count} for A-Z, like crypto_solver.analyze_frequency"""
+        return {chr(ord('A') + i): int(c) for i, c in enumerate(self.counts[1]) if c}
+
+    def top_ngrams(self, n, limit=10, min_count=2):
+        """Most common n-grams with at least min_count occurrences"""
+        counts = self.counts[n]
+        best = np.argsort(-counts, kind='stable')[:limit]
+        return [(_gram_text(i, n), int(counts[i])) for i in best if counts[i] >= min_count]
+
+    def kasiski_periods(self, limit=5):
+        """Periods 2..max_period by share of repeat spacings they divide"""
+        if not self.repeats:
+            return []
+        shares = self.period_votes[2:] / self.repeats
+        order = np.argsort(-shares, kind='stable')[:limit]
+        return [(int(i) + 2, float(shares[i])) for i in order]
+
+
+def _gram_text(index, n):
+    letters = []
+    for _ in range(n):
+        index, value = divmod(int(index), 26)
+        letters.append(chr(ord('A') + value))
+    return ''.join(reversed(letters))
+
+
+def analyze_file(path=None, chunk_size=CHUNK, **options):
+    """Stream a file (memory-mapped) or stdin through a StreamAnalyzer"""
+    analyzer = StreamAnalyzer(**options)
+    if path is None or path == '-':
+        while True:
+            chunk = sys.stdin.buffer.read(chunk_size)
+            if not chunk:
+                break
+            analyzer.feed(chunk)
+        return analyzer
+
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return analyzer
+        with mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(mapped), chunk_size):
+                    analyzer.feed(view[start:start + chunk_size])
+            finally:
+                view.release()
+    return analyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming n-gram and repeat analysis")
+    parser.add_argument('file', nargs='?', help="ciphertext file (default: stdin)")
+    parser.add_argument('--max-n', type=int, default=5, choices=range(1, 6))
+    parser.add_argument('--max-period', type=int, default=20)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK)
+    args = parser.parse_args()
+
+    analyzer = analyze_file(args.file, args.chunk_size, max_n=args.max_n, max_period=args.max_period)
+    print(f"Letters: {analyzer.letters:,}")
+
+    print("=== Frequency Analysis ===")
+    for char, count in sorted(analyzer.frequencies().items(), key=lambda x: x[1], reverse=True):
+        print(f"{char}: {count}")
+
+    print("\n=== Repeated patterns ===")
+    for n in range(2, args.max_n + 1):
+        repeated = analyzer.top_ngrams(n, args.top)
+        if repeated:
+            print(f"Length {n} patterns: {dict(repeated)}")
+
+    print("\n=== Kasiski ===")
+    print(f"Repeated trigram spacings: {analyzer.repeats:,}")
+    common = np.argsort(-analyzer.spacing_histogram[1:-1], kind='stable')[:args.top] + 1
+    print("Most common spacings:", {int(s): int(analyzer.spacing_histogram[s]) for s in common
+                                    if analyzer.spacing_histogram[s]})
+    for period, share in analyzer.kasiski_periods():
+        print(f"Period {period:2d}: divides {share:.2%} of spacings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+General monoalphabetic substitution breaker.
+
+Each restart starts from a random key (the first from a frequency-order
+guess), then does simulated annealing over letter swaps scored by quadgram
+fitness. As the temperature falls it becomes a plain hill climb. The
+ciphertext is reduced once to its distinct quadgrams and their counts, so
+scoring a key costs O(distinct quadgrams), not O(text length). Restarts run
+in a process pool. The search stops early once several restarts agree on
+the same plaintext.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from cipher_engine import (PreparedText, UPPER, add_ciphertext_arguments, add_workers_argument, read_ciphertext,
+                           substitution_decrypt)
+from ngram_score import QUADGRAM_FILE, QuadgramScorer, quadgram_ids
+from vigenere_solver import ENGLISH_FREQ
+
+# Each worker process's _CipherQuadgrams for the ciphertext, built once by _init_worker
+_state = None
+
+
+class _CipherQuadgrams:
+    """Distinct ciphertext quadgrams split into letters, with their counts"""
+
+    def __init__(self, text, scorer):
+        values = PreparedText(text).values
+        self.table = scorer.table
+        self.letters_present = np.unique(values)
+        self.windows = max(len(values) - 3, 1)
+        ids, self.counts = np.unique(quadgram_ids(values), return_counts=True)
+        self.a, rest = np.divmod(ids, 26 ** 3)
+        self.b, rest = np.divmod(rest, 26 ** 2)
+        self.c, self.d = np.divmod(rest, 26)
+        self.counts = self.counts.astype(np.float64)
+        self.frequency_order = np.argsort(-np.bincount(values, minlength=26), kind='stable')
+
+    def score(self, key):
+        """Per-quadgram log probability of the plaintext under a decryption key"""
+        ids = ((key[self.a] * 26 + key[self.b]) * 26 + key[self.c]) * 26 + key[self.d]
+        return float(self.table[ids] @ self.counts) / self.windows
+
+
+def _init_worker(text, quadgram_file):
+    global _state
+    _state = _CipherQuadgrams(text, QuadgramScorer(quadgram_file))
+
+
+def frequency_key(state):
+    """Decryption key mapping the nth commonest cipher letter to the nth commonest English letter"""
+    english_order = np.argsort(-ENGLISH_FREQ, kind='stable')
+    key = np.empty(26, dtype=np.int64)
+    key[state.frequency_order] = english_order
+    return key
+
+
+def anneal(state, key, rng, iterations=20000, temperature=0.05, patience=3000):
+    """
+    Simulated annealing over pairwise swaps of the decryption key.
+    Returns (best per-quadgram score, best key).
+    """
+    current = state.score(key)
+    best, best_key = current, key.copy()
+    stale = 0
+    for step in range(iterations):
+        t = temperature * (1 - step / iterations)
+        # Swapping two letters that never occur changes nothing
+        i = rng.choice(state.letters_present)
+        j = rng.randrange(26)
+        if i == j:
+            continue
+        key[i], key[j] = key[j], key[i]
+        candidate = state.score(key)
+        delta = candidate - current
+        if delta > 0 or (t > 0 and rng.random() < math.exp(delta / t)):
+            current = candidate
+            if current > best + 1e-12:
+                best, best_key, stale = current, key.copy(), 0
+                continue
+        else:
+            key[i], key[j] = key[j], key[i]
+        stale += 1
+        if stale >= patience and t < temperature / 4:
+            break
+    return best, best_key
+
+
+def _restart(seed, iterations, temperature, patience):
+    rng = random.Random(seed)
+    if seed == 0:
+        key = frequency_key(_state)
+    else:
+        key = np.array(rng.sample(range(26), 26), dtype=np.int64)
+    score, key = anneal(_state, key, rng, iterations, temperature, patience)
+    return score, key
+
+
+def cipher_alphabet(key):
+    """Cipher alphabet (for substitution_decrypt) from a decryption key"""
+    alphabet = [''] * 26
+    for cipher_letter, plain_letter in enumerate(key):
+        alphabet[plain_letter] = UPPER[cipher_letter]
+    return ''.join(alphabet)
+
+
+def _signature(key, letters_present):
+    """What the key does to the letters that actually occur in the text"""
+    return tuple(int(key[letter]) for letter in letters_present)
+
+
+def solve_substitution(text, restarts=32, workers=None, converge=3, iterations=20000,
+                       temperature=0.05, patience=3000, quadgram_file=QUADGRAM_FILE, log=sys.stderr):
+    """
+    Break a monoalphabetic substitution. Returns (per-quadgram score,
+    cipher alphabet, plaintext) for the best key found. Raises ValueError if
+    the text has fewer than two distinct letters: there is nothing to swap.
+    """
+    workers = workers or os.cpu_count() or 1
+    letters_present = np.unique(PreparedText(text).values)
+    if len(letters_present) < 2:
+        raise ValueError("substitution needs at least two distinct letters in the ciphertext")
+
+    best_score, best_key = -math.inf, None
+    agreeing = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(text, quadgram_file)) as pool:
+        seeds = iter(range(restarts))
+        pending = {pool.submit(_restart, seed, iterations, temperature, patience)
+                   for seed in _take(seeds, workers)}
+        finished = 0
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                score, key = future.result()
+                finished += 1
+                if best_key is not None and _signature(key, letters_present) == _signature(best_key, letters_present):
+                    agreeing += 1
+                elif score > best_score:
+                    best_score, best_key, agreeing = score, key, 1
+                if log:
+                    print(f"[*] restart {finished}/{restarts}: {score:.3f} (best {best_score:.3f}, "
+                          f"{agreeing} agreeing)", file=log, flush=True)
+            if agreeing >= converge:
+                for future in pending:
+                    future.cancel()
+                break
+            pending |= {pool.submit(_restart, seed, iterations, temperature, patience)
+                        for seed in _take(seeds, len(done))}
+
+    alphabet = cipher_alphabet(best_key)
+    return best_score, alphabet, substitution_decrypt(text, alphabet)
+
+
+def _take(iterator, count):
+    return [value for _, value in zip(range(count), iterator)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Break a monoalphabetic substitution cipher")
+    add_ciphertext_arguments(parser)
+    parser.add_argument('-r', '--restarts', type=int, default=32)
+    add_workers_argument(parser)
+    parser.add_argument('--converge', type=int, default=3, help="stop once this many restarts agree")
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    text = read_ciphertext(args)
+
+    try:
+        score, alphabet, plaintext = solve_substitution(text, args.restarts, args.workers,
+                                                        args.converge, args.iterations)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    print(f"Cipher alphabet: {alphabet}")
+    print(f"Fitness: {score:.3f}")
+    print(plaintext)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Single-step text transforms that layered challenges stack up, with a
+registry used by chain_search.py. Every transform is a module-level callable
+so it can be sent to worker processes.
+"""
+from functools import partial
+
+from cipher_engine import atbash, caesar_decrypt
+import keyboard_layouts
+import rail_fence
+
+
+def reverse_text(text):
+    """Simple reverse of the text"""
+    return text[::-1]
+
+
+def keyboard_shift(text, shift_type='qwerty', direction='right', distance=1):
+    """Try keyboard shift patterns"""
+    if (shift_type, direction, distance) not in keyboard_layouts.DECODE_TABLES:
+        return text
+    return keyboard_layouts.decode(text, shift_type, direction, distance)
+
+
+def rail_fence_all(text, rails):
+    """Rail fence decrypt over every character (punctuation included)"""
+    return rail_fence.decrypt(text, rails)
+
+
+def _build_registry():
+    registry = {
+        'atbash': atbash,
+        'reverse': reverse_text,
+    }
+    for layout, direction, distance in keyboard_layouts.DECODE_TABLES:
+        registry[f'keyboard-{layout}-{direction}-{distance}'] = partial(
+            keyboard_layouts.decode, layout=layout, direction=direction, distance=distance)
+    for shift in range(1, 26):
+        name = 'rot13' if shift == 13 else f'caesar-{shift}'
+        registry[name] = partial(caesar_decrypt, shift=shift)
+    for rails in range(2, 6):
+        registry[f'railfence-{rails}'] = partial(rail_fence_all, rails=rails)
+    return registry
+
+
+# name -> callable(text) for every transform the chain search may apply
+TRANSFORMS = _build_registry()
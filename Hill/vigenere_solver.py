@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Automatic Vigenere key recovery.
+
+The period is estimated with Kasiski examination (spacings between repeated
+trigrams) and the index of coincidence of each column. Every key letter is
+then recovered independently by chi-squared against English letter
+frequencies. All passes are NumPy bincounts over the letters, so the work is
+linear in the ciphertext length. Non-letters are skipped when advancing the
+key, matching vigenere_decrypt.
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from cipher_engine import PreparedText, UPPER
+
+# Relative frequencies of A-Z in English text
+ENGLISH_FREQ = np.array([
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094,
+    0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929,
+    0.00095, 0.05987, 0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150,
+    0.01974, 0.00074,
+])
+ENGLISH_IOC = float(np.sum(ENGLISH_FREQ ** 2))
+RANDOM_IOC = 1 / 26
+
+
+def letter_values(text):
+    """Letters of text as an array of 0-25, non-letters dropped"""
+    if isinstance(text, PreparedText):
+        return text.values
+    return PreparedText(text).values
+
+
+def chi_squared(counts):
+    """Chi-squared distance of letter counts (last axis = 26) from English"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1, keepdims=True)
+    expected = np.maximum(total, 1) * ENGLISH_FREQ
+    return np.sum((counts - expected) ** 2 / expected, axis=-1)
+
+
+def column_counts(values, period):
+    """Letter counts per key column, shape (period, 26)"""
+    full = len(values) - len(values) % period
+    index = values[:full].reshape(-1, period).astype(np.intp) + np.arange(0, period * 26, 26)
+    counts = np.bincount(index.ravel(), minlength=period * 26)
+    tail = len(values) - full
+    counts[:tail * 26] += np.bincount(np.arange(0, tail * 26, 26) + values[full:], minlength=tail * 26)
+    return counts.reshape(period, 26)
+
+
+def all_column_counts(values, max_period):
+    """
+    column_counts for every period 1..max_period. Only the upper half is
+    counted directly; a smaller period folds the columns of a multiple of it.
+    """
+    counts = {}
+    for period in range(max_period, 0, -1):
+        if period * 2 <= max_period:
+            multiple = counts[period * 2]
+            counts[period] = multiple.reshape(2, period, 26).sum(axis=0)
+        else:
+            counts[period] = column_counts(values, period)
+    return counts
+
+
+def index_of_coincidence(counts):
+    """Index of coincidence of letter counts (last axis = 26)"""
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum(axis=-1)
+    pairs = np.sum(counts * (counts - 1), axis=-1)
+    return np.where(total > 1, pairs / np.maximum(total * (total - 1), 1), 0.0)
+
+
+def kasiski_spacings(values, length=3):
+    """Distances between consecutive occurrences of every repeated n-gram"""
+    if len(values) < length:
+        return np.zeros(0, dtype=np.int64)
+    grams = np.zeros(len(values) - length + 1, dtype=np.int64)
+    for offset in range(length):
+        grams = grams * 26 + values[offset:len(values) - length + 1 + offset]
+    # 26**3 fits in uint16, which lets NumPy use its linear-time radix sort
+    dtype = np.uint16 if length <= 3 else np.int64
+    order = np.argsort(grams.astype(dtype), kind='stable')
+    same = grams[order[1:]] == grams[order[:-1]]
+    return (order[1:] - order[:-1])[same]
+
+
+def _closeness(ioc):
+    """0 for random-looking columns, 1 for English-like columns"""
+    return (ioc - RANDOM_IOC) / (ENGLISH_IOC - RANDOM_IOC)
+
+
+def _rank_periods(values, max_period):
+    """Column counts for every period plus the ranked (period, IoC, Kasiski) list"""
+    max_period = max(1, min(max_period, len(values) // 2 or 1))
+    spacings = np.bincount(kasiski_spacings(values), minlength=max_period + 1)
+    counts = all_column_counts(values, max_period)
+
+    candidates = []
+    for period in range(1, max_period + 1):
+        ioc = float(index_of_coincidence(counts[period]).mean())
+        kasiski = float(spacings[period::period].sum() / spacings.sum()) if spacings.sum() else 0.0
+        candidates.append((period, ioc, kasiski))
+
+    def score(candidate):
+        period, ioc, kasiski = candidate
+        # Every spacing is divisible by 1, so period 1 gets no Kasiski credit
+        return _closeness(ioc) + (kasiski if period > 1 else 0.0) * 0.5
+
+    ranked = sorted(candidates, key=score, reverse=True)
+    # A multiple of the true period scores about as well as the period itself;
+    # move a divisor that does nearly as well ahead of its multiple, but keep
+    # the multiple right after it in case it really is the period (ABCABD)
+    by_period = {candidate[0]: candidate for candidate in candidates}
+    promoted = []
+    for candidate in ranked:
+        period, ioc, _ = candidate
+        for divisor in range(1, period):
+            if period % divisor == 0 and _closeness(by_period[divisor][1]) >= 0.8 * _closeness(ioc):
+                if by_period[divisor] not in promoted:
+                    promoted.append(by_period[divisor])
+                break
+        if candidate not in promoted:
+            promoted.append(candidate)
+    return counts, promoted
+
+
+def estimate_period(text, max_period=20):
+    """
+    Rank candidate periods 1..max_period, best first.
+    Returns a list of (period, average column IoC, share of Kasiski spacings
+    divisible by the period).
+    """
+    return _rank_periods(letter_values(text), max_period)[1]
+
+
+def _key_from_counts(counts):
+    """Per-column shifts minimising chi-squared, for counts of shape (period, 26)"""
+    # rolled[c, s, i] = count of cipher letter (i + s) in column c
+    rolled = np.stack([np.roll(counts, -shift, axis=1) for shift in range(26)], axis=1)
+    return np.argmin(chi_squared(rolled), axis=1)
+
+
+def recover_key(text, period):
+    """Best key of the given period by per-column chi-squared"""
+    shifts = _key_from_counts(column_counts(letter_values(text), period))
+    return ''.join(UPPER[s] for s in shifts)
+
+
+def _minimal_key(key):
+    """Collapse keys like ABCABC down to their repeating unit ABC"""
+    for size in range(1, len(key) + 1):
+        if len(key) % size == 0 and key[:size] * (len(key) // size) == key:
+            return key[:size]
+    return key
+
+
+def solve_vigenere(text, max_period=20, candidates=5):
+    """
+    Recover the most likely Vigenere keys for text.
+    Returns a list of (key, chi-squared of plaintext, plaintext), most likely
+    period first.
+    """
+    prepared = text if isinstance(text, PreparedText) else PreparedText(text)
+    counts, ranked = _rank_periods(prepared.values, max_period)
+    results = []  # (period, key, score, plaintext)
+    seen = set()
+    for period, _, _ in ranked[:candidates]:
+        shifts = _key_from_counts(counts[period])
+        key = _minimal_key(''.join(UPPER[s] for s in shifts))
+        if key in seen:
+            continue
+        seen.add(key)
+        # Plaintext letter counts follow from the column counts without decrypting
+        plain_counts = sum(np.roll(column, -shift) for column, shift in zip(counts[period], shifts))
+        score = float(chi_squared(plain_counts))
+        result = (period, key, score, prepared.apply(shifts[:len(key)]))
+        # A multiple of a promoted divisor whose key doesn't repeat and fits far better is the real period
+        for i, (earlier, _, earlier_score, _) in enumerate(results):
+            if period % earlier == 0 and score < 0.5 * earlier_score:
+                results.insert(i, result)
+                break
+        else:
+            results.append(result)
+    return [(key, score, plaintext) for _, key, score, plaintext in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recover a Vigenere key from ciphertext")
+    parser.add_argument('file', nargs='?', help="ciphertext file (default: stdin)")
+    parser.add_argument('--max-period', type=int, default=20)
+    parser.add_argument('--candidates', type=int, default=5, help="periods to try")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    else:
+        text = sys.stdin.read()
+
+    print("=== Period Estimate ===")
+    for period, ioc, kasiski in estimate_period(text, args.max_period)[:args.candidates]:
+        print(f"Period {period:2d}: IoC {ioc:.4f}, Kasiski {kasiski:.2%}")
+
+    print("=== Recovered Keys ===")
+    for key, score, plaintext in solve_vigenere(text, args.max_period, args.candidates):
+        print(f"Key '{key}' (chi2 {score:.1f}): {plaintext[:80]}")
+
+
+if __name__ == "__main__":
+    main()
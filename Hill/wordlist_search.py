@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Wordlist-scale Vigenere/Caesar key search.
+
+Streams a (rockyou-style) wordlist in chunks across a process pool and keeps
+only the best N keys in a bounded heap. Workers score a key from the
+ciphertext's per-column letter counts, which are computed once per key length,
+so a key costs O(len(key)) no matter how long the ciphertext is. Only the
+final top N keys are actually decrypted.
+"""
+import argparse
+import heapq
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cipher_engine import (PreparedText, UPPER, add_ciphertext_arguments, add_workers_argument, read_ciphertext,
+                           submit_bounded, vigenere_decrypt)
+from vigenere_solver import chi_squared, column_counts
+
+# The ciphertext's letter values and, per key length, its column letter counts:
+# filled in each worker process by _init_worker and _counts_for
+_values = None
+_counts_by_period = {}
+
+
+def _init_worker(text):
+    """Prepare the ciphertext once per worker process"""
+    global _values, _counts_by_period
+    _values = PreparedText(text).values
+    _counts_by_period = {}
+
+
+def _normalise_key(word):
+    """Uppercase letters of a wordlist entry, or '' if it has none"""
+    return ''.join(c for c in word.upper() if c in UPPER)
+
+
+def _counts_for(period):
+    counts = _counts_by_period.get(period)
+    if counts is None:
+        counts = _counts_by_period[period] = column_counts(_values, period)
+    return counts
+
+
+def score_keys(keys):
+    """
+    Chi-squared of the plaintext under each key (lower is more English-like).
+    Keys of equal length are scored together as one gather over the column counts.
+    """
+    scores = {}
+    by_length = {}
+    for key in keys:
+        by_length.setdefault(len(key), []).append(key)
+    letters = np.arange(26)
+    for period, group in by_length.items():
+        counts = _counts_for(period)
+        shifts = np.frombuffer(''.join(group).encode('ascii'), dtype=np.uint8).reshape(-1, period) - ord('A')
+        # plain[k, i] = sum over columns c of counts[c, (i + shift[k, c]) % 26]
+        index = (letters[None, None, :] + shifts[:, :, None]) % 26
+        plain = np.take_along_axis(counts[None, :, :], index, axis=2).sum(axis=1)
+        scores.update(zip(group, chi_squared(plain).tolist()))
+    return scores
+
+
+def _score_chunk(words, top):
+    """Score a chunk of wordlist entries and return (entries seen, local top keys)"""
+    keys = {key for key in map(_normalise_key, words) if key}
+    scores = score_keys(keys)
+    return len(words), heapq.nsmallest(top, ((score, key) for key, score in scores.items()))
+
+
+def read_chunks(path, chunk_size):
+    """Yield lists of decoded wordlist entries without reading the whole file"""
+    chunk = []
+    with open(path, 'rb') as f:
+        for line in f:
+            word = line.strip().decode('utf-8', errors='ignore')
+            if word:
+                chunk.append(word)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+
+class TopK:
+    """Bounded heap of the N lowest-scoring unique keys"""
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []  # (-score, key) so the worst kept key is on top
+        self._keys = set()
+
+    def push(self, score, key):
+        if key in self._keys:
+            return
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, (-score, key))
+            self._keys.add(key)
+        elif -score > self._heap[0][0]:
+            _, dropped = heapq.heapreplace(self._heap, (-score, key))
+            self._keys.discard(dropped)
+            self._keys.add(key)
+
+    def results(self):
+        """(score, key) pairs, best first"""
+        return sorted((-neg_score, key) for neg_score, key in self._heap)
+
+
+def search_wordlist(text, wordlist, top=10, workers=None, chunk_size=5000,
+                    include_caesar=True, progress_every=2.0, log=sys.stderr):
+    """
+    Try every wordlist entry as a Vigenere key (plus all 26 Caesar shifts)
+    and return [(score, key, plaintext)] for the best `top` keys.
+    """
+    workers = workers or os.cpu_count() or 1
+    best = TopK(top)
+    start = last_report = time.time()
+    seen = 0
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(text,)) as pool:
+        chunks = read_chunks(wordlist, chunk_size)
+        if include_caesar:
+            chunks = _prepend(list(UPPER), chunks)
+        # The wordlist is read as chunks are scored, never queued up whole
+        for future in submit_bounded(pool, _score_chunk, chunks, workers * 2, top):
+            seen += _collect([future], best)
+            if log and time.time() - last_report >= progress_every:
+                last_report = time.time()
+                _report(seen, last_report - start, best, log)
+
+    if log:
+        _report(seen, time.time() - start, best, log)
+    return [(score, key, vigenere_decrypt(text, key)) for score, key in best.results()]
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+
+def _collect(futures, best):
+    """Merge finished chunk results into the global heap, returning entries seen"""
+    seen = 0
+    for future in futures:
+        count, local_best = future.result()
+        seen += count
+        for score, key in local_best:
+            best.push(score, key)
+    return seen
+
+
+def _report(seen, elapsed, best, log):
+    rate = seen / elapsed if elapsed else 0.0
+    leader = best.results()[0][1] if best.results() else '-'
+    print(f"[*] {seen:,} keys in {elapsed:.1f}s ({rate:,.0f} keys/sec), best so far: {leader}",
+          file=log, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank Vigenere/Caesar keys from a wordlist")
+    parser.add_argument('wordlist', help="wordlist path, e.g. rockyou.txt")
+    add_ciphertext_arguments(parser)
+    parser.add_argument('-n', '--top', type=int, default=10)
+    add_workers_argument(parser)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    text = read_ciphertext(args)
+
+    results = search_wordlist(text, args.wordlist, args.top, args.workers, args.chunk_size)
+    print("=== Best Keys ===")
+    for score, key, plaintext in results:
+        print(f"{key:16} (chi2 {score:7.1f}): {plaintext[:80]}")
+
+
+if __name__ == "__main__":
+    main()
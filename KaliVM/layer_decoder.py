@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Streaming multi-layer decoder for dumps like KaliVM/base64dump.
+
+The input is read in fixed-size chunks and passed through a chain of
+generator stages, each turning a stream of chunks into another. Nothing
+holds more than a chunk (plus a few carried bytes) at a time:
+  base64  line wraps removed, a partial 4-char group carried over
+  hex     whitespace removed, an odd trailing digit carried over
+  gzip / zlib
+          one decompressobj with automatic header detection, output capped
+          per call so a small input can't expand into one huge buffer;
+          concatenated gzip members are followed
+After every layer the first bytes of its output are sniffed. If they look
+like another layer (gzip/zlib magic that really decompresses, hex digits,
+base64 alphabet in evenly wrapped lines), a stage for it is stacked on top;
+otherwise the bytes are the final payload and go straight to the output.
+
+    python3 layer_decoder.py base64dump -o final_binary
+"""
+import argparse
+import binascii
+import itertools
+import string
+import sys
+import zlib
+
+CHUNK = 1 << 20
+SNIFF = 4096
+MAX_LAYERS = 16
+WHITESPACE = string.whitespace.encode()
+HEX_DIGITS = set(string.hexdigits.encode())
+BASE64_CHARS = set((string.ascii_letters + string.digits + '+/=').encode())
+
+
+def base64_stage(chunks):
+    carry = b''
+    for chunk in chunks:
+        data = carry + chunk.translate(None, WHITESPACE)
+        usable = len(data) - len(data) % 4
+        carry = data[usable:]
+        if usable:
+            yield binascii.a2b_base64(data[:usable])
+    if carry:
+        yield binascii.a2b_base64(carry + b'=' * (-len(carry) % 4))
+
+
+def hex_stage(chunks):
+    carry = b''
+    for chunk in chunks:
+        data = carry + chunk.translate(None, WHITESPACE)
+        usable = len(data) & ~1
+        carry = data[usable:]
+        if usable:
+            yield binascii.unhexlify(data[:usable])
+    if carry:
+        raise ValueError("hex layer has an odd number of digits")
+
+
+def zlib_stage(chunks):
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)  # gzip or zlib header
+    for chunk in chunks:
+        while chunk:
+            out = decompressor.decompress(chunk, CHUNK)
+            if out:
+                yield out
+            if decompressor.eof:
+                # Another gzip member may follow the one that just ended
+                chunk = decompressor.unused_data
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+                if chunk.strip(b'\0'):
+                    continue
+                break
+            chunk = decompressor.unconsumed_tail
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+STAGES = {'gzip/zlib': zlib_stage, 'hex': hex_stage, 'base64': base64_stage}
+
+
+def detect(sample, complete):
+    """
+    Name of the layer a stream starting with `sample` is in, or None.
+    complete says whether sample is the whole stream.
+    """
+    if sample[:2] == b'\x1f\x8b' or (len(sample) >= 2 and sample[0] & 0x0f == 8
+                                     and (sample[0] << 8 | sample[1]) % 31 == 0):
+        try:
+            zlib.decompressobj(zlib.MAX_WBITS | 32).decompress(sample, 64)
+            return 'gzip/zlib'
+        except zlib.error:
+            pass  # e.g. text that happens to start with 'x^'
+    text = sample.translate(None, WHITESPACE)
+    if len(text) < 8:
+        return None
+    chars = set(text)
+    if chars <= HEX_DIGITS and not (complete and len(text) % 2):
+        return 'hex'
+    # Line wraps but no spaces (text of plain words would pass otherwise), padding
+    # only at the end, a whole number of 4-char groups if that is everything,
+    # and wrapped at one width (a word list is all base64 characters too)
+    if (chars <= BASE64_CHARS and b' ' not in sample and b'\t' not in sample
+            and b'=' not in text.rstrip(b'=') and not (complete and len(text) % 4)
+            and _evenly_wrapped(sample)):
+        return 'base64'
+    return None
+
+
+def _evenly_wrapped(sample):
+    """One line, or lines of one width (a multiple of 4) with only the last shorter"""
+    lines = [line.rstrip(b'\r') for line in sample.rstrip(b'\r\n').split(b'\n')]
+    if len(lines) == 1:
+        return True
+    width = len(lines[0])
+    # The sample may end mid-line, so the last line can only be checked for length
+    return (width % 4 == 0 and all(len(line) == width for line in lines[1:-1])
+            and 0 < len(lines[-1]) <= width)
+
+
+def _sniff(chunks):
+    """Read at least SNIFF bytes: (sample, whether that is everything, remaining chunks)"""
+    buffered, size = [], 0
+    for chunk in chunks:
+        buffered.append(chunk)
+        size += len(chunk)
+        if size >= SNIFF:
+            return b''.join(buffered), False, chunks
+    return b''.join(buffered), True, iter(())
+
+
+def peel(chunks, layers, max_layers=MAX_LAYERS):
+    """Decode layers off a chunk stream, appending their names to `layers`; yields the payload"""
+    chunks = iter(chunks)
+    while True:
+        sample, complete, rest = _sniff(chunks)
+        kind = detect(sample, complete) if len(layers) < max_layers else None
+        stream = itertools.chain([sample], rest)
+        if kind is None:
+            yield from stream
+            return
+        layers.append(kind)
+        chunks = STAGES[kind](stream)
+
+
+def read_chunks(f, chunk_size=CHUNK):
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def decode_file(src, dst, chunk_size=CHUNK, max_layers=MAX_LAYERS):
+    """Peel every layer off binary file object src into dst: (layers, bytes written)"""
+    layers, written = [], 0
+    for chunk in peel(read_chunks(src, chunk_size), layers, max_layers):
+        dst.write(chunk)
+        written += len(chunk)
+    return layers, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode nested base64/hex/gzip/zlib layers")
+    parser.add_argument('input', nargs='?', default='-', help="encoded dump (default: stdin)")
+    parser.add_argument('-o', '--output', default='final_binary', help="'-' for stdout")
+    parser.add_argument('--max-layers', type=int, default=MAX_LAYERS)
+    args = parser.parse_args()
+
+    src = sys.stdin.buffer if args.input == '-' else open(args.input, 'rb')
+    dst = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        layers, written = decode_file(src, dst, max_layers=args.max_layers)
+    except (ValueError, binascii.Error, zlib.error) as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        if src is not sys.stdin.buffer:
+            src.close()
+        if dst is not sys.stdout.buffer:
+            dst.close()
+    print(f"Layers: {' -> '.join(layers) or 'none'}", file=sys.stderr)
+    print(f"Decoded {written} bytes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
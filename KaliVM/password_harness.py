@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Parallel password harness for ./rockyou (replaces brute_force_oneliner.py).
+
+Each candidate is piped to the target exactly once and its output is kept,
+so a hit is printed without a second run. A pool of worker threads keeps
+`workers` target processes running at a time (the work is all in the child
+processes, so threads are enough). The first success sets a stop flag that
+every worker checks before taking its next candidate. The wordlist is
+memory-mapped and never decoded (see wordlist.py), so odd bytes pass through
+untouched. Repeated words are skipped, and with --checkpoint an interrupted
+run resumes where it stopped.
+
+    python3 password_harness.py rockyou.txt -w 16 --checkpoint rockyou.ckpt
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from prioritize import prioritized
+from wordlist import Candidates, Checkpoint, Wordlist, parse_shard
+
+FAIL_MARKER = b"Incorrect password"
+
+
+class TargetError(Exception):
+    """The target program can't be run at all (missing, not executable, ...)"""
+
+
+def try_password(target, password, fail_marker=FAIL_MARKER, timeout=5):
+    """Run the target once with the password on stdin: (success, output)"""
+    try:
+        result = subprocess.run(target, input=password + b'\n', capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False, b''
+    return fail_marker not in result.stdout, result.stdout
+
+
+class Harness:
+    """
+    Shares an iterator of (line, password) candidates between worker threads
+    and stops them on the first hit. on_done(line) is called, under the
+    harness lock, after each candidate has run.
+    """
+
+    def __init__(self, target, candidates, fail_marker=FAIL_MARKER, timeout=5, on_done=None):
+        self.target = target
+        self.candidates = iter(candidates)
+        self.on_done = on_done
+        self.fail_marker = fail_marker
+        self.timeout = timeout
+        self.found = None
+        self.found_line = None
+        self.error = None
+        self.executions = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _next(self):
+        with self._lock:
+            if self._stop.is_set():
+                return None
+            candidate = next(self.candidates, None)
+            if candidate is None:
+                self._stop.set()
+            return candidate
+
+    def _worker(self):
+        while True:
+            candidate = self._next()
+            if candidate is None:
+                return
+            line, password = candidate
+            try:
+                success, output = try_password(self.target, password, self.fail_marker, self.timeout)
+            except OSError as e:
+                # Same for every candidate, so stop everyone; the candidate isn't marked done
+                with self._lock:
+                    self.error = self.error or e
+                    self._stop.set()
+                return
+            with self._lock:
+                self.executions += 1
+                if self.on_done:
+                    self.on_done(line)
+                if success and self.found is None:
+                    self.found = (password, output)
+                    self.found_line = line
+                    self._stop.set()
+
+    def run(self, workers=None, progress_every=2.0, log=sys.stderr):
+        """
+        Try candidates until one succeeds or they run out; returns
+        (password, output) or None. Raises TargetError if the target can't run.
+        """
+        workers = workers or (os.cpu_count() or 1) * 4
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        start = last_report = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(progress_every)
+                if log and time.time() - last_report >= progress_every:
+                    last_report = time.time()
+                    self._report(last_report - start, log)
+        if log:
+            self._report(time.time() - start, log)
+            print(file=log)
+        if self.error:
+            raise TargetError(f"cannot run target {' '.join(self.target)}: {self.error}")
+        return self.found
+
+    def _report(self, elapsed, log):
+        rate = self.executions / elapsed if elapsed else 0.0
+        print(f"\r[*] {self.executions:,} executions in {elapsed:.1f}s ({rate:,.0f} exec/sec)",
+              end='', file=log, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel password brute force against ./rockyou")
+    parser.add_argument('wordlist', nargs='?', default='rockyou.txt')
+    parser.add_argument('-t', '--target', default='./rockyou', help="program that reads the password on stdin")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="concurrent runs (default: 4 per core)")
+    parser.add_argument('--fail', default=FAIL_MARKER.decode(), help="output that marks a wrong password")
+    parser.add_argument('--timeout', type=float, default=5)
+    parser.add_argument('--shard', type=parse_shard, help="K/N: only the K-th of N equal parts of the wordlist")
+    parser.add_argument('--checkpoint', help="save progress here and resume from it if it exists")
+    parser.add_argument('--no-dedupe', action='store_true', help="don't skip repeated words")
+    parser.add_argument('-b', '--binary', help="try strings from this binary first, then the wordlist "
+                                               "in --order (see prioritize.py)")
+    parser.add_argument('--order', choices=['markov', 'file'], default='markov')
+    args = parser.parse_args()
+    if args.binary and (args.checkpoint or args.shard):
+        parser.error("--binary reorders the wordlist, so it can't be combined with --checkpoint or --shard")
+
+    with Wordlist(args.wordlist) as wordlist:
+        try:
+            found = _run_prioritized(args, wordlist) if args.binary else _run_wordlist(args, wordlist)
+        except TargetError as e:
+            sys.exit(f"Error: {e}")
+    if not found:
+        print("No password found")
+        sys.exit(1)
+    password, output = found
+    print(f"Password: {password.decode(errors='replace')}")
+    print(f"Output: {output.decode(errors='replace')}")
+
+
+def _run_prioritized(args, wordlist):
+    with open(args.binary, 'rb') as f:
+        ordered = prioritized(f.read(), wordlist, args.order, not args.no_dedupe)
+    return Harness([args.target], ordered, args.fail.encode(), args.timeout).run(args.workers)
+
+
+def _run_wordlist(args, wordlist):
+    shard = wordlist.shards(args.shard[1])[args.shard[0]] if args.shard else None
+    checkpoint = Checkpoint(args.checkpoint, wordlist, shard) if args.checkpoint else None
+    if checkpoint and checkpoint.found:
+        line, password, output = checkpoint.found
+        print(f"[*] {args.checkpoint} already has the password (line {line:,})", file=sys.stderr)
+        return password, output
+    if checkpoint and checkpoint.resume_line > checkpoint.shard[0]:
+        print(f"[*] Resuming at line {checkpoint.resume_line:,}", file=sys.stderr)
+    candidates = Candidates(wordlist, shard, checkpoint, not args.no_dedupe)
+    harness = Harness([args.target], candidates, args.fail.encode(), args.timeout, candidates.done)
+    try:
+        found = harness.run(args.workers)
+    except KeyboardInterrupt:
+        candidates.finish()
+        sys.exit("\n[*] Interrupted" + (f", progress saved to {args.checkpoint}" if checkpoint else ""))
+    except TargetError:
+        candidates.finish()
+        raise
+    candidates.finish((harness.found_line, *found) if found else None)
+    if candidates.skipped:
+        print(f"[*] Skipped {candidates.skipped:,} blank or repeated lines", file=sys.stderr)
+    return found
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Candidate ordering for the password harness: strings from the target binary
+first, then the wordlist ordered by a character model.
+
+A compared literal (strcmp shows up in the rockyou binary's strings) is
+often sitting in the binary itself, so every printable string is pulled
+out. The obvious toolchain noise is dropped: section and symbol names,
+mangled C++ names, library versions and short instruction-byte junk. The
+rest are ranked by how password-like they look and tried first, and so are
+the tokens inside them (e.g. the body of flag{...}).
+
+After that the wordlist is tried in order of a byte bigram (Markov) model
+trained on its first lines, which are the most common passwords in a
+frequency-sorted list like rockyou. Each line's log-probability is summed in
+NumPy over the memory-mapped file, so a 14M-line list is scored in seconds.
+
+    python3 prioritize.py rockyou rockyou.txt
+"""
+import argparse
+import re
+
+import numpy as np
+
+from wordlist import BloomFilter, Wordlist
+
+MIN_LENGTH = 4
+TRAIN_LINES = 100_000
+BLOCK_LINES = 1 << 20
+
+NOISE = re.compile(rb"""
+    ^[._]                                   # section names, reserved symbols
+  | ^\*?(?:N\d|St\d|_Z)                     # mangled C++ names
+  | \.so(?:\.\d+)*$ | \.(?:c|cc|cpp|o|h)$   # libraries and source/object files
+  | ^(?:GLIBC|GLIBCXX|CXXABI|GCC)[_:]       # symbol versions, compiler banner
+  | @ | ^/lib | ^DW\.ref\.
+""", re.VERBOSE)
+TOOLCHAIN_SYMBOLS = {
+    b'main', b'strcmp', b'frame_dummy', b'completed.0', b'deregister_tm_clones',
+    b'register_tm_clones', b'crtstuff.c', b'Scrt1.o', b'abort', b'puts', b'printf',
+}
+SECRET_HINTS = re.compile(rb'(?i)flag|pass|secret|key|ctf|\{.*\}|admin|root')
+
+
+def extract_strings(data, min_length=MIN_LENGTH):
+    """Printable ASCII runs of at least min_length bytes"""
+    return [match.group() for match in re.finditer(rb'[\x20-\x7e]{%d,}' % min_length, data)]
+
+
+def _tokens(string):
+    return [token for token in re.split(rb'[^A-Za-z0-9]+', string) if len(token) >= MIN_LENGTH]
+
+
+def secret_score(string, model=None):
+    """Heuristic 'looks like a secret' score; None for toolchain noise"""
+    if NOISE.search(string) or string in TOOLCHAIN_SYMBOLS:
+        return None
+    letters = sum(c in b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ' for c in string)
+    digits = sum(c in b'0123456789' for c in string)
+    if len(string) <= 5 and letters < len(string):
+        return None  # instruction bytes that happen to be printable, e.g. '[A\]'
+    score = 0.0
+    score += 1.0 if 6 <= len(string) <= 40 else 0.0
+    score += 1.0 if letters and digits else 0.0
+    score += 2.0 if SECRET_HINTS.search(string) else 0.0
+    score -= 1.0 if b' ' in string else 0.0
+    score -= 0.5 * string.count(b'_')
+    score += (letters + digits) / len(string)
+    if model is not None:
+        score += 0.5 * float(model.score([string])[0]) / (len(string) + 1)
+    return score
+
+
+def rank_strings(data, model=None):
+    """Strings (and their alphanumeric tokens) from a binary, most secret-looking first"""
+    scored = {}
+    for string in extract_strings(data):
+        if secret_score(string) is None:
+            continue  # and so are its pieces
+        for candidate in [string] + _tokens(string):
+            score = secret_score(candidate, model)
+            if score is not None:
+                scored[candidate] = max(score, scored.get(candidate, score))
+    return sorted(scored, key=lambda string: scored[string], reverse=True)
+
+
+class BigramModel:
+    """Byte bigram log-probabilities, with '\\n' as the start/end symbol"""
+
+    def __init__(self, log_probs):
+        self.log_probs = log_probs
+
+    @classmethod
+    def train(cls, wordlist, lines=TRAIN_LINES):
+        counts = np.ones(256 * 256, dtype=np.float64)  # add-one smoothing
+        stop = min(lines, len(wordlist))
+        if stop:
+            counts += np.bincount(_bigram_ids(wordlist, 0, stop), minlength=256 * 256)
+        counts = counts.reshape(256, 256)
+        return cls(np.log(counts / counts.sum(axis=1, keepdims=True)).astype(np.float32).ravel())
+
+    def score(self, strings):
+        """Log-probability of each bytes string"""
+        return [float(self.log_probs[_pairs(b'\n' + s + b'\n')].sum()) for s in strings]
+
+    def line_scores(self, wordlist, block_lines=BLOCK_LINES):
+        """Log-probability of every line of a Wordlist, as float32"""
+        scores = np.empty(len(wordlist), dtype=np.float32)
+        for first in range(0, len(wordlist), block_lines):
+            last = min(first + block_lines, len(wordlist))
+            log_probs = self.log_probs[_bigram_ids(wordlist, first, last)]
+            # Transitions of line i start where the newline before it sits
+            bounds = wordlist.starts[first:last] - wordlist.starts[first]
+            scores[first:last] = np.add.reduceat(log_probs, bounds) if len(log_probs) else 0
+        return scores
+
+
+def _pairs(data):
+    values = np.frombuffer(data, dtype=np.uint8).astype(np.int32)
+    return values[:-1] * 256 + values[1:]
+
+
+def _bigram_ids(wordlist, first, last):
+    """Bigram ids of lines first..last-1, newline-framed, in file order"""
+    start, stop = int(wordlist.starts[first]), int(wordlist.starts[last])
+    data = b'\n' + wordlist._map[start:stop]
+    if not data.endswith(b'\n'):
+        data += b'\n'
+    return _pairs(data)
+
+
+def markov_order(wordlist, model):
+    """Line numbers of the wordlist, most probable under the model first"""
+    return np.argsort(-model.line_scores(wordlist), kind='stable')
+
+
+def prioritized(binary_data, wordlist, order='markov', dedupe=True, model=None):
+    """
+    Yield (line, password) candidates: binary strings first (line None),
+    then wordlist lines in model or file order. Repeats are skipped.
+    """
+    model = model or BigramModel.train(wordlist)
+    seen = BloomFilter(len(wordlist) + 4096) if dedupe else None
+    for string in rank_strings(binary_data, model):
+        if seen is None or not seen.add(string):
+            yield None, string
+    lines = markov_order(wordlist, model) if order == 'markov' else range(len(wordlist))
+    for number in lines:
+        password = wordlist.line(int(number))
+        if password.strip() and (seen is None or not seen.add(password)):
+            yield int(number), password
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the order candidates would be tried in")
+    parser.add_argument('binary', help="target binary to mine for strings")
+    parser.add_argument('wordlist', nargs='?')
+    parser.add_argument('-n', '--count', type=int, default=30)
+    parser.add_argument('--order', choices=['markov', 'file'], default='markov')
+    args = parser.parse_args()
+
+    with open(args.binary, 'rb') as f:
+        data = f.read()
+    if not args.wordlist:
+        for string in rank_strings(data)[:args.count]:
+            print(string.decode())
+        return
+    with Wordlist(args.wordlist) as wordlist:
+        for index, (line, password) in enumerate(prioritized(data, wordlist, args.order)):
+            if index >= args.count:
+                break
+            source = 'binary' if line is None else f"line {line:,}"
+            print(f"{index + 1:4d}  {source:>14}  {password.decode(errors='replace')}")
+
+
+if __name__ == "__main__":
+    main()
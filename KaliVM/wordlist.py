@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped wordlist access with a cached line index, a Bloom filter for
+duplicates and resumable checkpoints.
+
+The wordlist is mmapped and never decoded. A NumPy array of line start
+offsets is built once, by scanning for newlines a block at a time, and saved
+next to the wordlist as <wordlist>.idx.npy. It is rebuilt when the
+wordlist's size or mtime no longer match. With the index, line i is a slice
+of the map, and the list splits into equal shards by line number.
+
+A checkpoint records the first line that has not been fully tried, plus the
+lines after it that are done (workers finish out of order). The same file
+holds the Bloom filter's bits, so a resumed run skips the same duplicates and
+retries exactly the lines that were in flight when it stopped. Saving only
+copies that state; a background thread writes it, so workers don't wait on
+the disk. Once a
+password works it is saved too, so a rerun reports it instead of carrying on
+past it.
+
+    python3 wordlist.py rockyou.txt --shards 4
+"""
+import argparse
+import hashlib
+import json
+import math
+import mmap
+import os
+import threading
+import time
+
+import numpy as np
+
+BLOCK = 1 << 26
+
+
+class Wordlist:
+    """Line-indexed, memory-mapped view of a wordlist file"""
+
+    def __init__(self, path, index_path=None):
+        self.path = path
+        self.index_path = index_path or path + '.idx.npy'
+        self.size = os.path.getsize(path)
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self.starts = self._load_index()
+
+    def _load_index(self):
+        stat = os.stat(self.path)
+        if os.path.exists(self.index_path) and os.path.getmtime(self.index_path) >= stat.st_mtime:
+            starts = np.load(self.index_path, mmap_mode='r')
+            if len(starts) and starts[-1] == self.size:
+                return starts
+        starts = self._build_index()
+        tmp = self.index_path + '.tmp.npy'
+        np.save(tmp, starts)
+        os.replace(tmp, self.index_path)
+        return starts
+
+    def _build_index(self):
+        """Start offset of every line, with the file size appended as a sentinel"""
+        pieces = [np.zeros(1, dtype=np.int64)]
+        data = np.frombuffer(self._map, dtype=np.uint8) if self.size else np.zeros(0, np.uint8)
+        for start in range(0, self.size, BLOCK):
+            pieces.append(np.flatnonzero(data[start:start + BLOCK] == ord('\n')) + start + 1)
+        del data
+        starts = np.concatenate(pieces)
+        if starts[-1] != self.size:  # last line has no newline
+            starts = np.append(starts, self.size)
+        return starts
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def line(self, number):
+        """Line `number` as bytes, without its line ending"""
+        return self._map[int(self.starts[number]):int(self.starts[number + 1])].rstrip(b'\r\n')
+
+    def lines(self, start=0, stop=None):
+        """(line number, bytes) for lines start..stop-1"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for number in range(start, stop):
+            yield number, self.line(number)
+
+    def shards(self, count):
+        """count (start, stop) line ranges of near-equal length"""
+        bounds = np.linspace(0, len(self), count + 1).astype(int)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def close(self):
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over bytes, k bit positions by double hashing"""
+
+    def __init__(self, capacity, error_rate=1e-4, bits=None):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        """Add item; True if it was (probably) already present"""
+        present = True
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            if not self.bits[byte] >> bit & 1:
+                present = False
+                self.bits[byte] |= 1 << bit
+        return present
+
+    def __contains__(self, item):
+        return all(self.bits[p // 8] >> (p % 8) & 1 for p in self._positions(item))
+
+
+class Checkpoint:
+    """Resumable progress through a wordlist: every line before resume_line is done"""
+
+    def __init__(self, path, wordlist, shard=None, save_every=5.0):
+        self.path = path
+        self.wordlist = wordlist
+        self.shard = list(shard or (0, len(wordlist)))
+        self.save_every = save_every
+        self.resume_line = self.issued = self.shard[0]
+        self.done = set()
+        self.found = None  # (line, password, output) once a password has worked
+        self.bloom_bits = None
+        self.error = None  # an OSError from the last write, raised by flush()
+        self._last_save = time.time()
+        self._pending = None
+        self._writing = False
+        self._writer = None
+        self._pending_ready = threading.Condition()
+        if os.path.exists(path):
+            # One JSON line, then the Bloom filter's bits
+            with open(path, 'rb') as f:
+                state = json.loads(f.readline())
+                bits = f.read()
+            if (state['wordlist'] == os.path.abspath(wordlist.path) and state['size'] == wordlist.size
+                    and state['shard'] == self.shard):
+                self.resume_line, self.issued = state['resume_line'], state['issued']
+                self.done = set(state['done'])
+                found = state.get('found')
+                if found:
+                    self.found = (found['line'], bytes.fromhex(found['password']), bytes.fromhex(found['output']))
+                self.bloom_bits = bytearray(bits) if bits else None
+
+    def mark_done(self, line):
+        self.done.add(line)
+        while self.resume_line in self.done:
+            self.done.remove(self.resume_line)
+            self.resume_line += 1
+
+    def save(self, bloom=None, force=False):
+        """
+        Snapshot the progress (and the Bloom bits) and hand it to a writer
+        thread. Callers hold the harness lock here, so only the copy happens
+        under it; the file is written outside. force waits until it is on disk.
+        """
+        if not force and time.time() - self._last_save < self.save_every:
+            return
+        self._last_save = time.time()
+        state = {
+            'wordlist': os.path.abspath(self.wordlist.path),
+            'size': self.wordlist.size,
+            'shard': self.shard,
+            'resume_line': self.resume_line,
+            'resume_offset': int(self.wordlist.starts[min(self.resume_line, len(self.wordlist))]),
+            'issued': self.issued,
+            'done': sorted(self.done),
+            'found': self.found and {'line': self.found[0], 'password': self.found[1].hex(),
+                                     'output': self.found[2].hex()},
+        }
+        snapshot = (json.dumps(state).encode() + b'\n', bytes(bloom.bits) if bloom is not None else b'')
+        with self._pending_ready:
+            self._pending = snapshot  # an older one not written yet is superseded
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, daemon=True)
+                self._writer.start()
+            self._pending_ready.notify_all()
+        if force:
+            self.flush()
+
+    def flush(self):
+        """Wait until the latest snapshot is written"""
+        with self._pending_ready:
+            while self._pending is not None or self._writing:
+                self._pending_ready.wait()
+            if self.error:
+                raise self.error
+
+    def _write_loop(self):
+        while True:
+            with self._pending_ready:
+                while self._pending is None:
+                    self._pending_ready.wait()
+                (header, bits), self._pending = self._pending, None
+                self._writing = True
+            try:
+                # Both parts go in one file, replaced atomically, so they always agree
+                tmp = self.path + '.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(header)
+                    f.write(bits)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                self.error = e
+            finally:
+                with self._pending_ready:
+                    self._writing = False
+                    self._pending_ready.notify_all()
+
+
+class Candidates:
+    """
+    Iterate (line, password) over a wordlist (or one shard of it), skipping
+    blank lines and Bloom-filter duplicates and resuming from a checkpoint.
+    Call done(line) once a candidate has been tried.
+    """
+
+    def __init__(self, wordlist, shard=None, checkpoint=None, dedupe=True, error_rate=1e-4):
+        self.wordlist = wordlist
+        self.start, self.stop = shard or (0, len(wordlist))
+        self.checkpoint = checkpoint
+        self.bloom = None
+        if dedupe:
+            bits = checkpoint.bloom_bits if checkpoint else None
+            self.bloom = BloomFilter(self.stop - self.start, error_rate, bits)
+        self.skipped = 0
+
+    def __iter__(self):
+        checkpoint = self.checkpoint
+        start = max(self.start, checkpoint.resume_line) if checkpoint else self.start
+        retry_until = checkpoint.issued if checkpoint else start
+        for number, password in self.wordlist.lines(start, self.stop):
+            if checkpoint:
+                if number < retry_until:
+                    # Issued before the interruption: already through the filter
+                    if number in checkpoint.done:
+                        continue
+                    yield number, password
+                    continue
+                checkpoint.issued = number + 1
+            if not password.strip() or (self.bloom is not None and self.bloom.add(password)):
+                self.skipped += 1
+                self.done(number)
+                continue
+            yield number, password
+
+    def done(self, line):
+        if self.checkpoint:
+            self.checkpoint.mark_done(line)
+            self.checkpoint.save(self.bloom)
+
+    def finish(self, found=None):
+        """Save the final checkpoint, with the (line, password, output) that worked if there is one"""
+        if self.checkpoint:
+            if found:
+                self.checkpoint.found = found
+            self.checkpoint.save(self.bloom, force=True)
+
+
+def parse_shard(value):
+    """'2/8' -> (1, 8): second of eight shards, zero-based"""
+    index, count = (int(part) for part in value.split('/'))
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError("shard must be K/N with 1 <= K <= N")
+    return index - 1, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index a wordlist and show its shards")
+    parser.add_argument('wordlist')
+    parser.add_argument('--shards', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.time()
+    with Wordlist(args.wordlist) as wordlist:
+        print(f"[*] {len(wordlist):,} lines, {wordlist.size:,} bytes, indexed in {time.time() - start:.2f}s "
+              f"({wordlist.index_path})")
+        for number, (first, last) in enumerate(wordlist.shards(args.shards), start=1):
+            print(f"    shard {number}/{args.shards}: lines {first:,}-{last - 1:,} "
+                  f"(bytes {int(wordlist.starts[first]):,}-{int(wordlist.starts[last]):,})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+strings(1) replacement: printable runs in ASCII, UTF-8 and UTF-16LE/BE with
+file offsets, scanned from a memory map across a process pool.
+
+Each worker maps the file itself and runs compiled byte regexes over its
+chunk in place (re searches the mmap between pos and endpos, no copy).
+A worker reports only strings that start inside its own chunk:
+  - a match that runs into the end of the scan window (chunk + overlap) is
+    rescanned with a larger window until it ends, so long strings that cross
+    a chunk boundary come out whole, from the worker they start in
+  - scanning starts `overlap` bytes before the chunk (further if a run
+    crosses that point), so matching is in step with a scan of the whole
+    file by the time it reaches the chunk; earlier matches are dropped
+So the output is the same for any chunk size or worker count.
+
+    python3 strings_extract.py image.bin -e ascii utf-16le -t x
+"""
+import argparse
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+CHUNK = 1 << 24
+OVERLAP = 1 << 12
+MIN_LENGTH = 4
+
+PRINTABLE = rb'[\x20-\x7e\t]'
+UNITS = {
+    'ascii': PRINTABLE,
+    # Well-formed UTF-8 only: no overlong forms or surrogates
+    'utf-8': PRINTABLE + rb'|[\xc2-\xdf][\x80-\xbf]'
+                         rb'|\xe0[\xa0-\xbf][\x80-\xbf]|[\xe1-\xec\xee\xef][\x80-\xbf]{2}|\xed[\x80-\x9f][\x80-\xbf]'
+                         rb'|\xf0[\x90-\xbf][\x80-\xbf]{2}|[\xf1-\xf3][\x80-\xbf]{3}|\xf4[\x80-\x8f][\x80-\xbf]{2}',
+    'utf-16le': PRINTABLE + rb'\x00',
+    'utf-16be': rb'\x00' + PRINTABLE,
+}
+UNIT_BYTES = {'ascii': 1, 'utf-8': 4, 'utf-16le': 2, 'utf-16be': 2}
+CODECS = {'ascii': 'ascii', 'utf-8': 'utf-8', 'utf-16le': 'utf-16-le', 'utf-16be': 'utf-16-be'}
+
+
+def compile_patterns(encodings, min_length=MIN_LENGTH):
+    """encoding -> (run regex, single unit regex, bytes a run may need past its start)"""
+    return {name: (re.compile(rb'(?:%s){%d,}' % (UNITS[name], min_length)), re.compile(rb'(?:%s)' % UNITS[name]),
+                   (min_length + 1) * UNIT_BYTES[name])
+            for name in encodings}
+
+
+def _continues(data, position, unit, unit_bytes):
+    """Whether a run could extend left past `position`"""
+    return any(unit.fullmatch(data[position - size:position])
+               for size in range(1, min(unit_bytes, position) + 1))
+
+
+def _scan_from(data, start, run, unit, unit_bytes, overlap):
+    """
+    Where to start scanning so matches line up with a scan of the whole
+    file: `overlap` bytes back, or further while a run crosses that point
+    """
+    back = overlap
+    while True:
+        begin = max(0, start - back)
+        first = run.search(data, begin, start + 1)
+        # A leftmost match that could still grow to the left must reach past begin
+        if not begin or not first or not _continues(data, first.start(), unit, unit_bytes):
+            return begin
+        back *= 2
+
+
+def scan(data, start, stop, patterns, overlap=OVERLAP):
+    """[(offset, encoding, text)] for runs starting in data[start:stop]"""
+    hits = []
+    both_ascii = 'ascii' in patterns
+    for name, (run, unit, reach) in patterns.items():
+        codec, unit_bytes = CODECS[name], UNIT_BYTES[name]
+        skip_ascii = name == 'utf-8' and both_ascii
+        position = _scan_from(data, start, run, unit, unit_bytes, overlap)
+        # A run starting just before stop must fit in the window to be seen at all
+        window = min(stop + max(overlap, reach), len(data))
+        while position < stop:
+            last = None
+            for match in run.finditer(data, position, window):
+                if match.start() >= stop:
+                    break
+                if match.end() > window - unit_bytes and window < len(data):
+                    last = match  # the next unit may straddle the window's end
+                    break
+                if match.start() < start:
+                    continue  # belongs to the previous chunk
+                raw = match.group()
+                if skip_ascii and raw.isascii():
+                    continue  # already reported as ASCII
+                hits.append((match.start(), name, raw.decode(codec)))
+            if last is None:
+                break
+            # Grow the window and look again from the cut-off match
+            position = last.start()
+            window = min(len(data), window + max(overlap, window - start))
+    hits.sort()
+    return hits
+
+
+def _scan_chunk(path, start, stop, encodings, min_length):
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return scan(data, start, stop, compile_patterns(encodings, min_length))
+
+
+def extract(path, encodings=('ascii',), min_length=MIN_LENGTH, workers=None, chunk_size=CHUNK):
+    """Yield (offset, encoding, text) for every string in the file, in offset order"""
+    size = os.path.getsize(path)
+    if not size:
+        return
+    workers = workers or os.cpu_count() or 1
+    starts = range(0, size, chunk_size)
+    stops = [min(start + chunk_size, size) for start in starts]
+    if workers == 1 or len(starts) == 1:
+        for start, stop in zip(starts, stops):
+            yield from _scan_chunk(path, start, stop, encodings, min_length)
+        return
+    count = len(starts)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map keeps chunk order, so output stays sorted by offset
+        for hits in pool.map(_scan_chunk, [path] * count, starts, stops, [encodings] * count,
+                             [min_length] * count):
+            yield from hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract printable strings (ASCII, UTF-8, UTF-16)")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-n', '--min-length', type=int, default=MIN_LENGTH)
+    parser.add_argument('-e', '--encodings', nargs='+', choices=list(UNITS), default=['ascii'])
+    parser.add_argument('-t', '--radix', choices=['d', 'x'], help="print offsets in decimal or hex")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="default: all cores")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK)
+    args = parser.parse_args()
+
+    show_encoding = len(args.encodings) > 1
+    out = sys.stdout
+    for path in args.files:
+        prefix = f"{path}: " if len(args.files) > 1 else ''
+        for offset, encoding, text in extract(path, args.encodings, args.min_length, args.workers,
+                                              args.chunk_size):
+            fields = [prefix]
+            if args.radix:
+                fields.append(f"{offset:7x} " if args.radix == 'x' else f"{offset:7d} ")
+            if show_encoding:
+                fields.append(f"[{encoding}] ")
+            fields.append(text)
+            out.write(''.join(fields) + '\n')
+
+
+if __name__ == "__main__":
+    main()
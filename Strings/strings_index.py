@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Strings index for ELF binaries: every string tagged with the section it sits
+in, C++ symbols demangled, and the result cached by the binary's hash.
+
+The section headers are read straight from the ELF header (32/64-bit, either
+byte order), so each hit from strings_extract.py gets a section name by
+bisecting the sorted section offsets. That separates what we care about
+(.rodata, .data) from the linker's symbol tables (.dynstr, .strtab), which
+are most of the output for a C++ binary.
+
+Mangled names (_Z...) are demangled in one c++filt run per batch, and every
+result is memoized, so a name shared by several binaries is only demangled
+once. The finished index is saved as JSON under the SHA-256 of the file's
+contents, so analysing the same binary again just loads it, wherever the
+file has been copied to.
+
+    python3 strings_index.py ../KaliVM/rockyou ../Game/game --hide-symbols
+"""
+import argparse
+import bisect
+import hashlib
+import json
+import os
+import re
+import struct
+import subprocess
+import sys
+import time
+
+from strings_extract import MIN_LENGTH, extract
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.strings_index')
+INDEX_VERSION = 1
+SHT_NOBITS = 8
+# Type names in typeinfo objects are mangled without the _Z prefix (N3obf12bool_functorE)
+TYPE_NAME = re.compile(r'^\*?(?:N\d|St\d|\d+[A-Za-z_])')
+# Sections holding symbol and version names rather than program data
+SYMBOL_SECTIONS = {'.dynstr', '.strtab', '.shstrtab', '.symtab', '.dynsym', '.gnu.version_r', '.gnu.version_d',
+                   '.comment', '.interp', '.note.gnu.build-id', '.note.ABI-tag', '.note.gnu.property'}
+
+
+def elf_sections(f):
+    """[(name, file offset, size)] of the sections with file contents; [] if f is not ELF"""
+    f.seek(0)
+    ident = f.read(64)
+    if len(ident) < 52 or ident[:4] != b'\x7fELF' or ident[4] not in (1, 2) or ident[5] not in (1, 2):
+        return []
+    order = '<' if ident[5] == 1 else '>'
+    if ident[4] == 2:
+        shoff, = struct.unpack_from(order + 'Q', ident, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(order + 'HHH', ident, 0x3a)
+        entry = order + 'IIQQQQIIQQ'
+    else:
+        shoff, = struct.unpack_from(order + 'I', ident, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(order + 'HHH', ident, 0x2e)
+        entry = order + 'IIIIIIIIII'
+    if not shoff or shentsize < struct.calcsize(entry):
+        return []  # stripped of section headers
+    f.seek(shoff)
+    first = f.read(shentsize)
+    if len(first) < shentsize:
+        return []
+    header = struct.unpack_from(entry, first)
+    # Extended numbering: the real counts live in section 0
+    shnum = shnum or header[5]
+    if shstrndx == 0xffff:
+        shstrndx = header[7]
+    table = first + f.read(shentsize * (shnum - 1))
+    headers = [struct.unpack_from(entry, table, i * shentsize) for i in range(len(table) // shentsize)]
+    if shstrndx >= len(headers):
+        return []
+    f.seek(headers[shstrndx][4])
+    names = f.read(headers[shstrndx][5])
+    sections = []
+    for name, kind, _flags, _addr, offset, size, *_ in headers[1:]:
+        if kind == SHT_NOBITS or not size or name >= len(names):
+            continue  # no contents, or a name offset past a truncated string table
+        end = names.find(b'\0', name)
+        sections.append((names[name:end if end >= 0 else len(names)].decode(errors='replace'), offset, size))
+    return sorted(sections, key=lambda section: section[1])
+
+
+def section_of(sections, starts, offset):
+    """Name of the section containing file offset, or None"""
+    i = bisect.bisect_right(starts, offset) - 1
+    if i >= 0 and offset < sections[i][1] + sections[i][2]:
+        return sections[i][0]
+    return None
+
+
+_demangled = {}
+
+
+def demangle(names):
+    """{name: demangled} for mangled C++ names, one c++filt run for the ones not seen before"""
+    todo = sorted({name for name in names if name.startswith('_Z') and name not in _demangled})
+    if todo:
+        try:
+            result = subprocess.run(['c++filt'], input='\n'.join(todo) + '\n', capture_output=True, text=True,
+                                    check=True)
+            lines = result.stdout.splitlines()
+        except (OSError, subprocess.CalledProcessError):
+            lines = []
+        if len(lines) != len(todo):
+            lines = todo  # no demangler: keep the names as they are
+        _demangled.update(zip(todo, lines))
+    return {name: _demangled[name] for name in names if name in _demangled and _demangled[name] != name}
+
+
+def _mangled(section, text):
+    """The mangled name a string stands for, if any"""
+    name = text.split('@')[0]  # .strtab names can carry @@GLIBCXX_3.4
+    if name.startswith('_Z'):
+        return name
+    if section in ('.rodata', '.data.rel.ro') and TYPE_NAME.match(text):
+        return '_ZTS' + text.lstrip('*')
+    return None
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_index(path, encodings=('ascii',), min_length=MIN_LENGTH, workers=None):
+    with open(path, 'rb') as f:
+        sections = elf_sections(f)
+    starts = [offset for _, offset, _ in sections]
+    hits = [[offset, section_of(sections, starts, offset), encoding, text]
+            for offset, encoding, text in extract(path, encodings, min_length, workers)]
+    for hit in hits:
+        hit.append(_mangled(hit[1], hit[3]))
+    names = demangle([name for *_, name in hits if name])
+    for hit in hits:
+        name = hit.pop()
+        demangled = names.get(name)
+        if demangled and name.startswith('_ZTS') and not hit[3].startswith('_ZTS'):
+            demangled = demangled.replace('typeinfo name for ', '', 1)
+        hit.append(demangled)
+    return {
+        'version': INDEX_VERSION,
+        'encodings': list(encodings),
+        'min_length': min_length,
+        'sections': [list(section) for section in sections],
+        'hits': hits,  # [offset, section, encoding, text, demangled or None]
+    }
+
+
+def load_index(path, encodings=('ascii',), min_length=MIN_LENGTH, workers=None, cache_dir=CACHE_DIR):
+    """(index, whether it came from the cache) for the binary at path"""
+    key = f"{file_hash(path)}-{'+'.join(encodings)}-{min_length}"
+    cache_path = os.path.join(cache_dir, key + '.json')
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index, True
+    index = build_index(path, encodings, min_length, workers)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = cache_path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp, cache_path)
+    return index, False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Section-tagged, demangled strings of ELF binaries (cached)")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('-n', '--min-length', type=int, default=MIN_LENGTH)
+    parser.add_argument('-e', '--encodings', nargs='+', default=['ascii'],
+                        choices=['ascii', 'utf-8', 'utf-16le', 'utf-16be'])
+    parser.add_argument('-s', '--sections', nargs='+', help="only strings from these sections, e.g. .rodata .data")
+    parser.add_argument('--hide-symbols', action='store_true', help="drop symbol tables, version names and notes")
+    parser.add_argument('-w', '--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    args = parser.parse_args()
+
+    for path in args.files:
+        start = time.time()
+        index, cached = load_index(path, args.encodings, args.min_length, args.workers, args.cache_dir)
+        hits = index['hits']
+        if args.sections:
+            hits = [hit for hit in hits if hit[1] in args.sections]
+        if args.hide_symbols:
+            hits = [hit for hit in hits if hit[1] not in SYMBOL_SECTIONS]
+        print(f"[*] {path}: {len(index['hits'])} strings in {len(index['sections'])} sections, "
+              f"{'cached' if cached else 'indexed'} in {time.time() - start:.2f}s", file=sys.stderr)
+        for offset, section, encoding, text, demangled in hits:
+            tag = f"[{encoding}] " if len(index['encodings']) > 1 else ''
+            print(f"{offset:8x}  {section or '-':<18} {tag}{text}" + (f"  ->  {demangled}" if demangled else ''))
+
+
+if __name__ == "__main__":
+    main()
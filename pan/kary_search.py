@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+K-ary search over a too-low / too-high oracle.
+
+Binary search asks one question per round, so finding a number in 1..10M
+takes about 24 sequential round trips. Here every round sends k probes at
+once, spaced evenly across the interval, and the answers cut it to about
+1/(k+1) of its size: log_{k+1} rounds instead of log2 (8 rounds for k=7,
+5 for k=31). The probes run on a thread pool; each one waits on a
+subprocess or a socket, so threads are enough.
+
+The oracle is the same as panpwn.test_number: number -> -1 (too low),
+1 (too high), 0 (found), anything else an error. Errored probes are simply
+asked again in a later round; if every probe of a round errored, the next
+one waits a jittered, exponentially growing delay (oracle.backoff_delay).
+ask_local() is the one implementation of the local binary's exit-code
+protocol; panpwn.py uses it too.
+
+    python3 kary_search.py ./pickanumber -k 7
+"""
+import argparse
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from oracle import backoff_delay
+from transport import FOUND_MARKER
+
+LOW, HIGH = 1, 10_000_000
+
+
+def probes(low, high, k):
+    """k distinct numbers splitting low..high into k+1 near-equal parts (all of them if fewer)"""
+    count = high - low + 1
+    if count <= k:
+        return list(range(low, high + 1))
+    return [low + count * i // (k + 1) for i in range(1, k + 1)]
+
+
+def kary_search(oracle, low=LOW, high=HIGH, k=7, max_failed_rounds=10, log=None):
+    """
+    Find the number the oracle accepts in low..high: (number or None,
+    rounds, queries). log, if given, is called with a message each round.
+    """
+    rounds = queries = failed = 0
+    with ThreadPoolExecutor(max_workers=k) as pool:
+        while low <= high:
+            points = probes(low, high, k)
+            verdicts = list(pool.map(oracle, points))
+            rounds += 1
+            queries += len(points)
+            for point, verdict in zip(points, verdicts):
+                if verdict == 0:
+                    return point, rounds, queries
+            too_low = [point for point, verdict in zip(points, verdicts) if verdict == -1]
+            too_high = [point for point, verdict in zip(points, verdicts) if verdict == 1]
+            new_low = max(too_low) + 1 if too_low else low
+            new_high = min(too_high) - 1 if too_high else high
+            if (new_low, new_high) == (low, high):
+                failed += 1
+                if failed >= max_failed_rounds:
+                    break
+                time.sleep(backoff_delay(failed - 1))  # every probe errored: give the target a moment
+            low, high = new_low, new_high
+            if log:
+                log(f"Round {rounds}: {len(points)} probes, range now [{low}, {high}]")
+    return None, rounds, queries
+
+
+def ask_local(binary, number, timeout=2):
+    """
+    One guess against a local pickanumber-style binary: (verdict, CompletedProcess).
+    Exit code 9 is too low (-1) and 10 too high (1); otherwise 0 if the flag
+    message is in the output, -2 if not. Raises subprocess.TimeoutExpired.
+    """
+    process = subprocess.run([binary], input=b'%d\n' % number, capture_output=True, timeout=timeout)
+    if process.returncode in (9, 10):
+        return {9: -1, 10: 1}[process.returncode], process
+    return (0 if FOUND_MARKER in process.stdout else -2), process
+
+
+def local_oracle(binary):
+    """Oracle running a local pickanumber-style binary"""
+    def oracle(number):
+        try:
+            return ask_local(binary, number)[0]
+        except subprocess.TimeoutExpired:
+            return -2
+    return oracle
+
+
+def main():
+    parser = argparse.ArgumentParser(description="K-ary search with k concurrent probes per round")
+    parser.add_argument('binary', nargs='?', default='./pickanumber')
+    parser.add_argument('-k', type=int, default=7, help="probes per round")
+    parser.add_argument('--low', type=int, default=LOW)
+    parser.add_argument('--high', type=int, default=HIGH)
+    args = parser.parse_args()
+
+    start = time.time()
+    number, rounds, queries = kary_search(local_oracle(args.binary), args.low, args.high, args.k, log=print)
+    print(f"[*] {'Found ' + str(number) if number is not None else 'Not found'}: {rounds} rounds, "
+          f"{queries} probes, {time.time() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
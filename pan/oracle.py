@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Cached, retrying oracle for the pick-a-number searches.
+
+CachedOracle wraps any number -> verdict function (panpwn.test_number,
+kary_search.local_oracle, ...) with three things:
+  - a SQLite cache of (target, number) -> verdict shared by every run, so a
+    number is never asked about twice. From it VerdictCache.bounds() gives
+    the interval a previous search had narrowed to, and the next search
+    starts there.
+  - in-flight deduplication: concurrent calls for the same number (k-ary
+    rounds, several threads) share one query
+  - exponential backoff with jitter on errors instead of a flat sleep,
+    up to `retries` attempts, after which the error verdict is returned
+Only too-low / too-high answers are cached. A "found" is not: a single
+misread response saved as found would end every later search on the wrong
+number, while asking for the right one again costs one query.
+
+The target key names what is being asked, e.g. 'remote:vacr.io:5277' or
+'local:<sha256 of the binary>', so a rebuilt binary starts a fresh cache.
+
+    python3 oracle.py --target remote:vacr.io:5277
+"""
+import argparse
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'oracle_cache.sqlite3')
+VERDICTS = (-1, 0, 1)
+CACHED_VERDICTS = (-1, 1)
+RETRIES = 6
+BASE_DELAY = 0.25
+MAX_DELAY = 8.0
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY, max_delay=MAX_DELAY):
+    """
+    Seconds to wait before retry number attempt + 1. Full jitter: anywhere up
+    to the exponential step, so retrying threads spread out.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def local_target(binary):
+    """Cache key for a local binary: its contents, not its path"""
+    with open(binary, 'rb') as f:
+        return 'local:' + hashlib.sha256(f.read()).hexdigest()
+
+
+def remote_target(host, port):
+    return f"remote:{host}:{port}"
+
+
+class VerdictCache:
+    """(target, number) -> verdict table in SQLite, usable from several threads"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('CREATE TABLE IF NOT EXISTS verdicts ('
+                         'target TEXT NOT NULL, number INTEGER NOT NULL, verdict INTEGER NOT NULL, '
+                         'PRIMARY KEY (target, number)) WITHOUT ROWID')
+
+    def get(self, target, number):
+        with self._lock:
+            row = self._db.execute('SELECT verdict FROM verdicts WHERE target = ? AND number = ?',
+                                   (target, number)).fetchone()
+        return row[0] if row else None
+
+    def put(self, target, number, verdict):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?)', (target, number, verdict))
+
+    def bounds(self, target, low, high):
+        """
+        (low, high) narrowed by every cached answer for target: just above
+        the largest too-low number, just below the smallest too-high one.
+        low > high means the answers contradict each other (see clear()).
+        """
+        with self._lock:
+            too_low, = self._db.execute('SELECT MAX(number) FROM verdicts WHERE target = ? AND verdict = -1',
+                                        (target,)).fetchone()
+            too_high, = self._db.execute('SELECT MIN(number) FROM verdicts WHERE target = ? AND verdict = 1',
+                                         (target,)).fetchone()
+        if too_low is not None:
+            low = max(low, too_low + 1)
+        if too_high is not None:
+            high = min(high, too_high - 1)
+        return low, high
+
+    def clear(self, target):
+        """Forget every answer for target"""
+        with self._lock:
+            self._db.execute('DELETE FROM verdicts WHERE target = ?', (target,))
+
+    def targets(self):
+        """[(target, number of cached answers)]"""
+        with self._lock:
+            return self._db.execute('SELECT target, COUNT(*) FROM verdicts GROUP BY target').fetchall()
+
+    def close(self):
+        self._db.close()
+
+
+class CachedOracle:
+    """
+    Callable number -> verdict around `query`, with the cache, in-flight
+    deduplication and backoff described above. Counts queries actually sent.
+    """
+
+    def __init__(self, query, target, cache=None, retries=RETRIES, base_delay=BASE_DELAY, max_delay=MAX_DELAY,
+                 log=None):
+        self.query = query
+        self.target = target
+        self.cache = cache
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.log = log
+        self.queries = self.hits = 0
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def __call__(self, number):
+        verdict = self.cache.get(self.target, number) if self.cache else None
+        if verdict is not None:
+            with self._lock:
+                self.hits += 1
+            return verdict
+        with self._lock:
+            future = self._in_flight.get(number)
+            owner = future is None
+            if owner:
+                future = self._in_flight[number] = Future()
+        if not owner:
+            return future.result()  # someone is already asking
+        try:
+            # Answered (and cached) between the lookup above and taking ownership?
+            verdict = self.cache.get(self.target, number) if self.cache else None
+            if verdict is None:
+                verdict = self._ask(number)
+            if verdict in CACHED_VERDICTS and self.cache:
+                self.cache.put(self.target, number, verdict)
+            future.set_result(verdict)
+            return verdict
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[number]
+
+    def _ask(self, number):
+        for attempt in range(self.retries):
+            with self._lock:
+                self.queries += 1
+            try:
+                verdict = self.query(number)
+            except Exception as e:
+                verdict = -2
+                error = e
+            else:
+                error = None
+            if verdict in VERDICTS:
+                return verdict
+            if attempt + 1 < self.retries:
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                if self.log:
+                    self.log(f"Error on {number}{f' ({error})' if error else ''}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+        return verdict
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what the oracle cache knows")
+    parser.add_argument('--cache', default=CACHE_FILE)
+    parser.add_argument('--target', help="e.g. remote:vacr.io:5277 (default: every target in the cache)")
+    parser.add_argument('--low', type=int, default=1)
+    parser.add_argument('--high', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    cache = VerdictCache(args.cache)
+    for target, count in cache.targets():
+        if args.target and target != args.target:
+            continue
+        low, high = cache.bounds(target, args.low, args.high)
+        state = f"range [{low}, {high}]" if low <= high else "answers contradict each other"
+        print(f"[*] {target}: {count} cached answers, {state}")
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,28 @@
 #!/usr/bin/env python3
+import argparse
 import subprocess
-import sys
+import threading
 import time
 from pwn import *
 
+from kary_search import ask_local, kary_search
+from oracle import CACHE_FILE, CachedOracle, VerdictCache, local_target, remote_target
+from transport import HOST, PORT, Transport, parse_address
+
 # Enable debugging
 context.log_level = 'info'
 
+# One transport per searching thread, each keeping its session (or a pool) open between guesses
+remote_address = (HOST, PORT)
+transports = []
+_local = threading.local()
+
+def get_transport():
+    if not hasattr(_local, 'transport'):
+        _local.transport = Transport(*remote_address)
+        transports.append(_local.transport)
+    return _local.transport
+
 def test_number(number, use_remote=False):
     """
     Test a number against the pickanumber binary or remote server
@@ -14,45 +30,25 @@ def test_number(number, use_remote=False):
         -1 if number is too low
         1 if number is too high
         0 if number is correct (and prints the flag)
+        -2 on errors and responses that are none of these
     """
     if use_remote:
         try:
-            # Connect to remote server
-            conn = remote('vacr.io', 5277)
-            
-            # Wait for prompt and send number
-            conn.recvuntil(b':')
-            conn.sendline(str(number).encode())
-            
-            # Get response
-            response = conn.recvall(timeout=3).decode()
-            
-            # Close connection
-            conn.close()
-            
-            # Process response
-            if "Too low" in response:
-                return -1
-            elif "Too high" in response:
-                return 1
-            else:
-                print(f"Got interesting response: {response}")
-                return 0
+            verdict, response = get_transport().guess(number)
+            if verdict == 0:
+                print(f"Got interesting response: {response.decode(errors='replace')}")
+            elif verdict == -2:
+                log.warning(f"Unrecognized response to {number}: {response.decode(errors='replace')!r}")
+            return verdict
                 
         except Exception as e:
             log.error(f"Error with remote connection: {e}")
-            time.sleep(1)  # Add delay to avoid overwhelming the server
             return -2  # Error value
     else:
         # Use local binary
         try:
             # Run the pickanumber binary with the number as input
-            process = subprocess.run(
-                ["./pickanumber"], 
-                input=f"{number}\n".encode(), 
-                capture_output=True,
-                timeout=2
-            )
+            verdict, process = ask_local("./pickanumber", number)
             
             stdout = process.stdout.decode()
             stderr = process.stderr.decode()
@@ -61,19 +57,15 @@ def test_number(number, use_remote=False):
             log.info(f"Exit code: {exit_code}")
             log.info(f"Output: {stdout}")
             
-            # Process based on exit code - we observed code 9 for too low, 10 for too high
-            if exit_code == 9:  # Too low
-                return -1
-            elif exit_code == 10:  # Too high  
-                return 1
-            else:
-                # If exit code is neither 9 nor 10, we might have found the answer
+            # Exit code 9 is too low, 10 too high; otherwise the flag message means found
+            if verdict == 0:
                 log.success(f"Got exit code {exit_code}, checking output...")
-                if stdout:
-                    log.success(f"Output: {stdout}")
+                log.success(f"Output: {stdout}")
                 if stderr:
                     log.success(f"Error: {stderr}")
-                return 0
+            elif verdict == -2:
+                log.warning(f"Unexpected exit code {exit_code} for {number}: {stdout!r} {stderr!r}")
+            return verdict
                 
         except subprocess.TimeoutExpired:
             log.error(f"Process timed out at number {number}")
@@ -83,41 +75,85 @@ def test_number(number, use_remote=False):
             return -2  # Error value
 
 def main():
+    global remote_address
+    parser = argparse.ArgumentParser(description="Find the pickanumber number by bisection")
+    parser.add_argument('target', nargs='?', default=f"{HOST}:{PORT}",
+                        help="'local' for ./pickanumber, or HOST:PORT (e.g. a standin_server.py)")
+    parser.add_argument('-k', type=int, default=1, help="probes per round, run concurrently (see kary_search.py)")
+    parser.add_argument('--cache', default=CACHE_FILE, help="SQLite file of answers shared between runs")
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args()
+
     # Check if we should use local or remote
-    use_remote = True
-    if len(sys.argv) > 1 and sys.argv[1] == 'local':
-        use_remote = False
-        log.info("Using local binary")
+    use_remote = args.target != 'local'
+    if use_remote:
+        remote_address = parse_address(args.target)
+        log.info(f"Using remote server {remote_address[0]}:{remote_address[1]}")
     else:
-        log.info("Using remote server")
+        log.info("Using local binary")
+    
+    # Every answer is cached; errors are retried with backoff (see oracle.py)
+    target = remote_target(*remote_address) if use_remote else local_target("./pickanumber")
+    cache = None if args.no_cache else VerdictCache(args.cache)
+    oracle = CachedOracle(lambda n: test_number(n, use_remote), target, cache, log=log.warning)
     
-    # Initialize binary search parameters
+    # Initialize binary search parameters, resuming from what earlier runs narrowed them to
     low = 1
     high = 10000000
+    if cache:
+        low, high = cache.bounds(target, low, high)
+        if low > high:
+            log.warning(f"Cached answers for {target} contradict each other, dropping them")
+            cache.clear(target)
+            low, high = 1, 10000000
+        elif (low, high) != (1, 10000000):
+            log.info(f"Resuming from cache: range [{low}, {high}]")
     
-    while low <= high:
-        # Calculate the middle value
-        mid = (low + high) // 2
-        log.info(f"Trying number: {mid} (range: [{low}, {high}])")
+    answer = None
+    if args.k > 1:
+        start = time.time()
+        number, rounds, queries = kary_search(oracle, low, high, args.k, log=log.info)
+        if number is not None:
+            log.success(f"Found it! Number is {number} ({rounds} rounds, {queries} probes, "
+                        f"{time.time() - start:.1f}s)")
+        else:
+            log.warning(f"Gave up after {rounds} rounds")
+        answer = number
+    else:
+        while low <= high:
+            # Calculate the middle value
+            mid = (low + high) // 2
+            log.info(f"Trying number: {mid} (range: [{low}, {high}])")
         
-        # Test the number
-        result = test_number(mid, use_remote)
+            # Test the number
+            result = oracle(mid)
         
-        # Process the result
-        if result == -1:  # Too low
-            low = mid + 1
-            log.info(f"Too low, adjusting range: [{low}, {high}]")
-        elif result == 1:  # Too high
-            high = mid - 1
-            log.info(f"Too high, adjusting range: [{low}, {high}]")
-        elif result == 0:  # Correct
-            log.success(f"Found it! Number is {mid}")
-            break
-        else:  # Error
-            log.warning(f"Error occurred, retrying with same number")
-            time.sleep(1)  # Add delay before retrying
+            # Process the result
+            if result == -1:  # Too low
+                low = mid + 1
+                log.info(f"Too low, adjusting range: [{low}, {high}]")
+            elif result == 1:  # Too high
+                high = mid - 1
+                log.info(f"Too high, adjusting range: [{low}, {high}]")
+            elif result == 0:  # Correct
+                log.success(f"Found it! Number is {mid}")
+                answer = mid
+                break
+            else:  # Error
+                log.warning(f"Still failing after {oracle.retries} tries, retrying with same number")
     
-    log.info(f"Final answer: {low}")
+    if answer is not None:
+        log.info(f"Final answer: {answer}")
+    log.info(f"{oracle.queries} queries sent, {oracle.hits} answered from cache")
+    if cache:
+        cache.close()
+    if transports:
+        log.info(f"{sum(transport.connections for transport in transports)} connections opened")
+        for transport in transports:
+            transport.close()
+    if answer is None:
+        log.failure("No number found: the oracle never accepted a guess in range")
+        raise SystemExit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the pick-a-number server, for testing panpwn.py and
+transport.py without touching vacr.io.
+
+It speaks the same protocol as ./pickanumber: a prompt ending in ':', then
+"You entered N" and "Too low!" / "Too high!" or the flag message. By default
+it hangs up after one guess like the real service; --keep-open answers
+guesses on the same connection until the number is found. --latency delays
+every reply to imitate a remote round trip.
+
+    python3 standin_server.py --secret 1234567 --port 5277
+    python3 panpwn.py 127.0.0.1:5277
+"""
+import argparse
+import random
+import socket
+import socketserver
+import threading
+import time
+
+PROMPT = b"Enter a number between 1 and 10M :"
+LIMIT = 10_000_000
+
+
+class StandinServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    request_queue_size = 128  # k-ary searches open many connections at once
+    daemon_threads = True
+
+    def __init__(self, address, secret, keep_open=False, latency=0.0):
+        super().__init__(address, GuessHandler)
+        self.secret = secret
+        self.keep_open = keep_open
+        self.latency = latency
+        self.guesses = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+
+class GuessHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # Reply and next prompt are separate writes; don't let Nagle hold the prompt back
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send(self, data):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(data)
+
+    def handle(self):
+        server = self.server
+        with server._lock:
+            server.connections += 1
+        while True:
+            self._send(PROMPT)
+            line = self.rfile.readline()
+            if not line:
+                return
+            with server._lock:
+                server.guesses += 1
+            try:
+                number = int(line.strip() or b'0')
+            except ValueError:
+                number = 0
+            reply = b"You entered %d\n" % number
+            if number < server.secret:
+                reply += b"Too low!\n"
+            elif number > server.secret:
+                reply += b"Too high!\n"
+            else:
+                self._send(reply + b"The flag is the number.\n")
+                return
+            self._send(reply)
+            if not server.keep_open:
+                return
+
+
+def serve(secret, host='127.0.0.1', port=0, keep_open=False, latency=0.0):
+    """Start a stand-in server on a background thread; returns it (server.server_address has the port)"""
+    server = StandinServer((host, port), secret, keep_open, latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the pick-a-number server")
+    parser.add_argument('--secret', type=int, default=None, help="default: random in 1..10M")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5277)
+    parser.add_argument('--keep-open', action='store_true', help="allow many guesses per connection")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds to delay each reply")
+    args = parser.parse_args()
+
+    secret = args.secret or random.randint(1, LIMIT)
+    server = StandinServer((args.host, args.port), secret, args.keep_open, args.latency)
+    print(f"[*] Listening on {args.host}:{args.port}, secret {secret}, "
+          f"{'many guesses' if args.keep_open else 'one guess'} per connection")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[*] {server.guesses} guesses over {server.connections} connections")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Guess transport for the pick-a-number server (vacr.io:5277).
+
+Opening a fresh connection per guess and draining it with recvall(timeout=3)
+costs a TCP handshake plus three idle seconds every bisection step. Here a
+response is read only up to its verdict line ("Too low!", "Too high!" or
+the flag message), so a guess takes one round trip.
+
+The first guess decides how connections are used:
+  - if the server prompts again on the same connection, that session is
+    kept open for every later guess
+  - if it hangs up after answering, guesses are served from a small pool of
+    connections opened (and read up to their prompt) in the background, so
+    the handshake of the next guess overlaps the current one
+A connection that turns out to be dead is replaced and the guess retried once.
+
+    python3 transport.py 127.0.0.1:5277 1234 5000000
+"""
+import argparse
+import collections
+import re
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HOST, PORT = 'vacr.io', 5277
+PROMPT = re.compile(rb':\s*$')
+RESPONSE_END = re.compile(rb'Too (?:low|high)!?[ \t]*\r?\n|flag[^\n]*\n')
+FOUND_MARKER = b'flag'  # "The flag is the number."
+POOL_SIZE = 4
+TIMEOUT = 5
+
+
+def parse_response(response):
+    """-1 too low, 1 too high, 0 found (the flag message), -2 for anything else"""
+    if b'Too low' in response:
+        return -1
+    if b'Too high' in response:
+        return 1
+    if FOUND_MARKER in response:
+        return 0
+    return -2
+
+
+class Connection:
+    """One TCP connection, read up to a delimiter rather than a timeout"""
+
+    def __init__(self, host, port, timeout=TIMEOUT):
+        self.sock = socket.create_connection((host, port), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = b''
+
+    def read_until(self, pattern):
+        """Bytes up to and including the first match of pattern; None if the server hung up first"""
+        while True:
+            match = pattern.search(self.buffer)
+            if match:
+                data, self.buffer = self.buffer[:match.end()], self.buffer[match.end():]
+                return data
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                return None
+            self.buffer += chunk
+
+    def ready(self):
+        """Wait for the prompt; False if the server closed the connection instead"""
+        return self.read_until(PROMPT) is not None
+
+    def ask(self, number):
+        """Send a guess: (verdict, response)"""
+        self.sock.sendall(b'%d\n' % number)
+        response = self.read_until(RESPONSE_END)
+        if response is None:
+            response, self.buffer = self.buffer, b''
+            if not response:
+                raise ConnectionError("connection closed before the server answered")
+        verdict = parse_response(response)
+        if verdict not in (-1, 1):
+            response += self.read_rest()
+        return verdict, response
+
+    def read_rest(self, idle=0.5):
+        """Whatever else the server sends (e.g. after the flag line) until it closes or goes quiet"""
+        data, self.buffer = self.buffer, b''
+        self.sock.settimeout(idle)
+        try:
+            while True:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    break
+                data += chunk
+        except OSError:
+            pass
+        return data
+
+    def close(self):
+        self.sock.close()
+
+
+class Transport:
+    """Guesses over a kept-open session, or a pool of pre-opened connections if the server allows one guess each"""
+
+    def __init__(self, host=HOST, port=PORT, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.pool_size = pool_size
+        self.reusable = None  # unknown until the first answer
+        self.connections = 0
+        self._session = None
+        self._pool = collections.deque()
+        self._opener = ThreadPoolExecutor(max_workers=pool_size)
+
+    def _open(self):
+        conn = Connection(self.host, self.port, self.timeout)
+        if not conn.ready():
+            conn.close()
+            raise ConnectionError("server closed the connection before prompting")
+        return conn
+
+    def _refill(self):
+        while len(self._pool) < self.pool_size:
+            self._pool.append(self._opener.submit(self._open))
+
+    def _take(self):
+        """A connection sitting at the prompt"""
+        if self._session:
+            return self._session
+        self.connections += 1
+        if self.reusable is False:
+            self._refill()
+            conn = self._pool.popleft().result()
+            self._refill()
+            return conn
+        return self._open()
+
+    def guess(self, number):
+        """(verdict, response) for one guess: -1 too low, 1 too high, 0 found, -2 unrecognized"""
+        for attempt in range(2):
+            conn = None
+            try:
+                conn = self._take()
+                verdict, response = conn.ask(number)
+                break
+            except OSError:
+                # A stale session or pooled connection: retry once on a fresh one
+                self._session = None
+                if conn:
+                    conn.close()
+                if attempt:
+                    raise
+        prompted = False
+        if verdict in (-1, 1) and self.reusable is not False:
+            try:
+                prompted = conn.ready()
+            except OSError:
+                pass  # neither prompted nor hung up before the timeout: don't reuse it
+        if verdict not in (-1, 1):
+            self._session = None
+            conn.close()
+        elif prompted:
+            self.reusable = True
+            self._session = conn
+        else:
+            self._session = None
+            conn.close()
+            if not self.reusable:
+                self.reusable = False
+                self._refill()  # the next guess's connections open while this answer is used
+            else:
+                self.reusable = None  # the session went away; find out again on a new one
+        return verdict, response
+
+    def close(self):
+        if self._session:
+            self._session.close()
+            self._session = None
+        while self._pool:
+            future = self._pool.popleft()
+            if not future.exception():
+                future.result().close()
+        self._opener.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_address(value):
+    host, _, port = value.rpartition(':')
+    return host or HOST, int(port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send guesses through a reused connection and time them")
+    parser.add_argument('address', type=parse_address, help="HOST:PORT, e.g. 127.0.0.1:5277")
+    parser.add_argument('numbers', type=int, nargs='+')
+    parser.add_argument('--pool', type=int, default=POOL_SIZE)
+    args = parser.parse_args()
+
+    with Transport(*args.address, pool_size=args.pool) as transport:
+        for number in args.numbers:
+            start = time.time()
+            verdict, response = transport.guess(number)
+            mode = {None: '?', True: 'session', False: 'pool'}[transport.reusable]
+            print(f"[*] {number}: {verdict:+d} in {(time.time() - start) * 1000:.1f} ms ({mode}) "
+                  f"{response.decode(errors='replace').strip()!r}")
+
+
+if __name__ == "__main__":
+    main()